@@ -1,15 +1,88 @@
-from itertools import combinations, product
-import pandas as pd
-import re
+from collections import Counter
+from collections.abc import Sequence
+from itertools import combinations
+import numpy as np
+
+from footprint import CAUSAL, CHOICE, PARALLEL, REVERSE, SYMBOLS, Footprint
+from instrumentation import Instrumentation, instrumented
+from log_reader import DEFAULT_CHUNK_SIZE, count_event_log, count_log_text
+from maximal_pairs import enumerate_maximal_pairs
+from model_cache import log_fingerprint
+
+# Los módulos de funciones opcionales (importadores, minería paralela o por
+# muestreo, formato binario, flujos, conformidad y dibujo) se importan dentro
+# de los métodos que los usan para no alargar 'import alpha' (ver import_budget)
+
+# Atributos que forman el modelo minado (lo que se guarda en la caché)
+MINED_STATE = (
+    'activity_set', 'activity_index', 'direct_successions', 'succession_matrix', 'footprint',
+    'entry_tasks', 'exit_tasks', 'pattern_pairs', 'maximal_patterns',
+    'places', 'place_labels', 'flow_relations', 'pruned',
+)
+
+
+class EventLogView(Sequence):
+    """Vista de solo lectura que expande las variantes en trazas individuales"""
+
+    def __init__(self, variants):
+        self._variants = variants
+
+    def __len__(self):
+        return sum(self._variants.values())
+
+    def __iter__(self):
+        for trace, count in self._variants.items():
+            activities = list(trace)
+            for _ in range(count):
+                yield activities
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0:
+            raise IndexError("índice de traza fuera de rango")
+        for trace, count in self._variants.items():
+            if index < count:
+                return list(trace)
+            index -= count
+        raise IndexError("índice de traza fuera de rango")
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"EventLogView({len(self)} trazas, {len(self._variants)} variantes)"
+
 
 class Alpha:
-    def __init__(self):
-        self.event_log = []
-        self.direct_successions = {}
-        self.causal_relations = set()
-        self.concurrent_relations = set()
-        self.choice_relations = set()
+    def __init__(self, cache=None, min_count=1, min_relative=0.0, min_dependency=None):
+        # Caché opcional de modelos (ModelCache) indexada por la huella del log
+        self.cache = cache
+        self.fingerprint = None
+        # Umbrales de ruido: una sucesión a>b solo cuenta si los supera (ver set_thresholds)
+        self.min_count = min_count
+        self.min_relative = min_relative
+        self.min_dependency = min_dependency
+        self.pruned = {}
+        # Informe de la minería aproximada (None si se leyó el log completo)
+        self.sampling = None
+        self.cache_hit = False
+        # Instrumentación opcional por etapa (None = desactivada, sin coste)
+        self.instrumentation = None
+        # Multiconjunto de variantes: traza (tupla de actividades) -> frecuencia
+        self.variants = Counter()
+        # Sucesiones a>b con su frecuencia; None = se derivan de la matriz al primer acceso
+        self._direct_successions = {}
         self.activity_set = []
+        # Actividades internadas como enteros densos y matriz de sucesiones |A|x|A|
+        self.activity_index = {}
+        self.succession_matrix = np.zeros((0, 0), dtype=np.int64)
+        # Única representación de las relaciones: códigos int8 de la huella (ver propiedades)
+        self.footprint = Footprint.empty()
         self.places = []
         self.entry_tasks = []
         self.exit_tasks = []
@@ -18,120 +91,357 @@ class Alpha:
         self.maximal_patterns = []
         self.place_labels = []
         self.flow_relations = []
+        # Estado de la minería incremental
+        self.last_update = {}
+        self._pending_cells = set()
+        self._new_activities = set()
+
+    def set_thresholds(self, min_count=1, min_relative=0.0, min_dependency=None):
+        """Configura los umbrales que filtran sucesiones directas poco frecuentes.
+
+        min_count: número mínimo de apariciones de a>b.
+        min_relative: fracción mínima de a>b sobre todas las sucesiones que salen de a.
+        min_dependency: si la dependencia (|b>a| - |a>b|) / (|a>b| + |b>a| + 1)
+        alcanza este valor, a>b se descarta como ruido frente a b>a.
+        """
+        self.min_count = min_count
+        self.min_relative = min_relative
+        self.min_dependency = min_dependency
+        return self
+
+    def thresholds(self):
+        """Umbrales activos (vacío con los valores por defecto, que no filtran nada)"""
+        config = {}
+        if self.min_count > 1:
+            config['min_count'] = self.min_count
+        if self.min_relative:
+            config['min_relative'] = self.min_relative
+        if self.min_dependency is not None:
+            config['min_dependency'] = self.min_dependency
+        return config
+
+    @property
+    def direct_successions(self):
+        """Sucesiones a>b observadas con su frecuencia (se derivan de la matriz al primer acceso)"""
+        if self._direct_successions is None:
+            self._direct_successions = {
+                (self.activity_set[a], self.activity_set[b]): int(self.succession_matrix[a, b])
+                for a, b in zip(*np.nonzero(self.succession_matrix))
+            }
+        return self._direct_successions
+
+    @direct_successions.setter
+    def direct_successions(self, successions):
+        self._direct_successions = successions
+
+    @property
+    def causal_relations(self):
+        """Pares (a, b) con a -> b, como vista de conjunto sobre la huella"""
+        return self.footprint.relation(CAUSAL)
+
+    @property
+    def concurrent_relations(self):
+        """Pares (a, b) con a || b (ambas orientaciones), sin materializarlos"""
+        return self.footprint.relation(PARALLEL)
+
+    @property
+    def choice_relations(self):
+        """Pares (a, b) con a # b, reflexivos incluidos, sin materializarlos"""
+        return self.footprint.relation(CHOICE)
+
+    @property
+    def causal_matrix(self):
+        return self.footprint.mask(CAUSAL)
+
+    @property
+    def parallel_matrix(self):
+        return self.footprint.mask(PARALLEL)
+
+    @property
+    def choice_matrix(self):
+        return self.footprint.mask(CHOICE)
+
+    def enable_instrumentation(self, trace_memory=False, hook=None):
+        """Activa la medición por etapa; hook(record) se llama al terminar cada una"""
+        self.instrumentation = Instrumentation(trace_memory, [hook] if hook else [])
+        return self
+
+    def disable_instrumentation(self):
+        self.instrumentation = None
+        return self
+
+    def stage_report(self):
+        """Informe estructurado de las etapas medidas (vacío si no hay instrumentación)"""
+        return self.instrumentation.report() if self.instrumentation is not None else {}
+
+    @property
+    def event_log(self):
+        """Log expandido traza a traza, calculado a partir de las variantes"""
+        return EventLogView(self.variants)
+
+    @event_log.setter
+    def event_log(self, traces):
+        self.variants = Counter()
+        for trace in traces:
+            self.add_variant(trace)
+
+    def add_variant(self, activities, count=1):
+        """Registra una traza con su frecuencia en el multiconjunto de variantes"""
+        if count > 0:
+            self.variants[tuple(activities)] += count
+        return self
         
+    @instrumented('parse_event_log')
     def parse_event_log(self, log_string):
-        """Analiza un log de eventos en formato de texto"""
-        self.event_log = []
-        log_string = log_string.strip()
-        
-        # Quitar corchetes exteriores si existen
-        if log_string.startswith('[') and log_string.endswith(']'):
-            log_string = log_string[1:-1]
-        
-        # Encontrar todas las trazas usando expresiones regulares
-        trace_pattern = re.compile(r'<[^>]*>')
-        trace_matches = trace_pattern.findall(log_string)
-        
-        for trace_str in trace_matches:
-            # Extraer repeticiones (formato: <...>^n)
-            multiplier = 1
-            if '^' in trace_str:
-                trace_part, multiplier_part = trace_str.rsplit('^', 1)
-                multiplier = int(multiplier_part.strip())
-                trace_str = trace_part.strip()
-            
-            # Extraer actividades de la traza
-            activities = trace_str.strip('<>').replace(' ', '').split(',')
-            activities = [act for act in activities if act]
-            
-            # Añadir la traza el número de veces indicado
-            self.event_log.extend([activities] * multiplier)
-        
+        """Analiza un log de eventos en formato de texto, validándolo en la misma pasada (ver LogTokenizer)"""
+        self.variants = count_log_text(log_string)
         return self
 
+    @instrumented('parse_event_log_file')
+    def parse_event_log_file(self, source, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Analiza un log desde una ruta o fichero leyéndolo por bloques"""
+        # Cada bloque se agrega directamente en variantes (ver count_event_log)
+        self.variants = count_event_log(source, chunk_size)
+        return self
+
+    @instrumented('import_xes')
+    def import_xes(self, source, **options):
+        """Carga un log XES en las variantes leyéndolo traza a traza"""
+        from importers import iter_xes_traces
+
+        self.variants = Counter()
+        for activities in iter_xes_traces(source, **options):
+            self.add_variant(activities)
+        return self
+
+    @instrumented('import_csv')
+    def import_csv(self, source, **options):
+        """Carga un CSV (caso, actividad, marca de tiempo) en las variantes"""
+        from importers import iter_csv_traces
+
+        self.variants = Counter()
+        for activities in iter_csv_traces(source, **options):
+            self.add_variant(activities)
+        return self
+
+    @instrumented('discover_relations')
     def discover_relations(self):
         """Descubre las relaciones entre actividades en el log"""
+        # Un log equivalente ya minado se recupera entero de la caché
+        self.cache_hit = False
+        self.sampling = None
+        if self.cache is not None:
+            # Los umbrales cambian el modelo, así que forman parte de la huella
+            self.fingerprint = log_fingerprint(self.variants, extra=sorted(self.thresholds().items()))
+            state = self.cache.get(self.fingerprint)
+            if state is not None:
+                self.cache_hit = True
+                return self._restore_state(state)
+
         # Extraer conjunto de actividades únicas y ordenadas
-        self.activity_set = sorted({act for trace in self.event_log for act in trace})
-        self.direct_successions = {}
-
-        # Calcular sucesiones directas
-        for trace in self.event_log:
-            for i in range(len(trace) - 1):
-                pair = (trace[i], trace[i + 1])
-                self.direct_successions[pair] = self.direct_successions.get(pair, 0) + 1
-
-        # Inicializar conjuntos de relaciones
-        self.causal_relations = set()
-        self.concurrent_relations = set()
-        self.choice_relations = set()
-
-        # Analizar todos los pares posibles de actividades
-        for a, b in product(self.activity_set, self.activity_set):
-            if a == b:
-                self.choice_relations.add((a, b))  # Reflexivas
-                continue
+        self.activity_set = sorted({act for trace in self.variants for act in trace})
+        self.activity_index = {act: i for i, act in enumerate(self.activity_set)}
 
-            ab_count = self.direct_successions.get((a, b), 0)
-            ba_count = self.direct_successions.get((b, a), 0)
+        # Contar sucesiones directas en la matriz, ponderando cada variante por su frecuencia
+        self.succession_matrix = self._count_successions()
+        return self._finish_relations()
+
+    @instrumented('discover_relations_parallel')
+    def discover_relations_parallel(self, source=None, workers=None, shards=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Descubre las relaciones contando las sucesiones en varios procesos.
+
+        Con source (ruta de un log [<a,b>^n, ...]) cada trabajador lee su propio
+        rango de bytes del fichero y las variantes se cargan del resultado; sin
+        source se reparten las variantes ya cargadas. Las tablas parciales se
+        suman y el resultado es idéntico al de discover_relations.
+        """
+        from sharded import count_file, count_variants_parallel
+
+        if source is not None:
+            counts = count_file(source, workers, shards, chunk_size)
+            self.variants = counts['variants']
+        else:
+            counts = count_variants_parallel(self.variants, workers, shards)
+        self.cache_hit = False
+        self.fingerprint = None
+        self.sampling = None
+        return self._relations_from_counts(counts)
+
+    @instrumented('discover_relations_sampled')
+    def discover_relations_sampled(self, source=None, **options):
+        """Minería aproximada: descubre las relaciones de una muestra del log.
+
+        Lee el log (la ruta source o las variantes ya cargadas) por lotes en
+        orden estratificado o aleatorio y para en cuanto el soporte de
+        sucesiones directas converge según confidence o patience (ver
+        sampling.sample_log, que recibe las opciones). Las variantes pasan a
+        ser solo las leídas, y en sampling queda el informe con la fracción
+        del log procesada.
+        """
+        from sampling import sample_log
+        from sharded import count_variants
+
+        sample, report = sample_log(self.variants if source is None else source, **options)
+        self.variants = sample
+        self.cache_hit = False
+        # El modelo de una muestra no debe guardarse en la caché con la huella de otro log
+        self.fingerprint = None
+        self._relations_from_counts(count_variants(sample))
+        self.sampling = report
+        return self
+
+    def _relations_from_counts(self, counts):
+        """Vuelca una tabla de conteos (ver sharded) en la matriz de sucesiones y deriva las relaciones"""
+        self.activity_set = sorted(counts['activities'])
+        self.activity_index = {act: i for i, act in enumerate(self.activity_set)}
+
+        # Volcar la tabla combinada de sucesiones en la matriz de conteos
+        size = len(self.activity_set)
+        self.succession_matrix = np.zeros((size, size), dtype=np.int64)
+        if counts['successions']:
+            pairs = list(counts['successions'].items())
+            sources = np.fromiter((self.activity_index[a] for (a, _), _ in pairs), dtype=np.intp, count=len(pairs))
+            targets = np.fromiter((self.activity_index[b] for (_, b), _ in pairs), dtype=np.intp, count=len(pairs))
+            self.succession_matrix[sources, targets] = [count for _, count in pairs]
+        return self._finish_relations()
+
+    def _finish_relations(self):
+        """Deriva relaciones, huella y tareas de frontera de la matriz de sucesiones"""
+        self.direct_successions = None
+
+        # Clasificar todos los pares comparando M con su traspuesta en la huella compacta
+        self._classify_relations()
 
-            if ab_count > 0 and ba_count == 0:  # a → b pero no b → a
-                self.causal_relations.add((a, b))
-            elif ab_count > 0 and ba_count > 0:  # a → b y b → a
-                self.concurrent_relations.add((a, b))
-            elif ab_count == 0 and ba_count == 0:  # No sucesión directa
-                self.choice_relations.add((a, b))
-        
         # Identificar tareas de entrada y salida
         self._identify_boundary_tasks()
 
         return self
         
+    def _encode_trace(self, trace):
+        """Convierte una traza en un array de identificadores enteros"""
+        return np.fromiter((self.activity_index[act] for act in trace), dtype=np.intp, count=len(trace))
+
+    def _count_successions(self):
+        """Cuenta las sucesiones directas a>b en una matriz de enteros |A|x|A|"""
+        size = len(self.activity_set)
+        matrix = np.zeros((size, size), dtype=np.int64)
+        sources, targets, weights = self._encode_successions(self.variants)
+
+        # Una sola acumulación por lotes sobre todas las variantes codificadas
+        if len(sources):
+            np.add.at(matrix, (sources, targets), weights)
+        return matrix
+
+    def _encode_successions(self, variants):
+        """Codifica las sucesiones de unas variantes como arrays (origen, destino, peso)"""
+        sources, targets, weights = [], [], []
+
+        for trace, count in variants.items():
+            if len(trace) < 2:
+                continue
+            encoded = self._encode_trace(trace)
+            sources.append(encoded[:-1])
+            targets.append(encoded[1:])
+            weights.append(np.full(len(trace) - 1, count, dtype=np.int64))
+
+        if not sources:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty, np.zeros(0, dtype=np.int64)
+        return np.concatenate(sources), np.concatenate(targets), np.concatenate(weights)
+
+    def _follows(self, rows=None, cols=None):
+        """Máscara de las sucesiones rows>cols que superan los umbrales (sin índices, toda la matriz)"""
+        matrix = self.succession_matrix
+        if rows is None:
+            counts, reverse, totals = matrix, matrix.T, matrix.sum(axis=1, keepdims=True)
+        else:
+            counts, reverse, totals = matrix[rows, cols], matrix[cols, rows], matrix.sum(axis=1)[rows]
+        follows = counts >= max(self.min_count, 1)
+        if self.min_relative:
+            follows &= counts >= self.min_relative * totals
+        if self.min_dependency is not None:
+            follows &= (reverse - counts) / (counts + reverse + 1) < self.min_dependency
+        return follows
+
+    def _count_pruned(self):
+        """Cuenta los pares observados que descarta cada umbral (en orden de aplicación)"""
+        self.pruned = {'absolute': 0, 'relative': 0, 'dependency': 0}
+        if self.thresholds():
+            counts = self.succession_matrix
+            observed = counts > 0
+            kept_absolute = observed & (counts >= max(self.min_count, 1))
+            kept_relative = kept_absolute
+            if self.min_relative:
+                kept_relative = kept_absolute & (counts >= self.min_relative * counts.sum(axis=1, keepdims=True))
+            kept = kept_relative & self._follows()
+            self.pruned = {
+                'absolute': int(np.count_nonzero(observed & ~kept_absolute)),
+                'relative': int(np.count_nonzero(kept_absolute & ~kept_relative)),
+                'dependency': int(np.count_nonzero(kept_relative & ~kept)),
+            }
+        self.pruned['total'] = sum(self.pruned.values())
+        return self
+
+    def _classify_relations(self):
+        """Construye la huella: las celdas sin sucesión en ningún sentido y las reflexivas quedan como #"""
+        follows = self._follows()
+        self._count_pruned()
+        reverse = follows.T
+        reflexive = np.eye(len(self.activity_set), dtype=bool)
+
+        causal = follows & ~reverse & ~reflexive      # a → b pero no b → a
+        parallel = follows & reverse & ~reflexive     # a → b y b → a
+        self.footprint = Footprint.from_relations(self.activity_set, causal, parallel)
+        return self
+
     def _identify_boundary_tasks(self):
         """Identifica las tareas de entrada y salida en el proceso"""
-        all_tasks = set(self.activity_set)
-        
-        # Tareas con alguna entrada (aparecen como destino en relaciones causales)
-        tasks_with_input = {b for _, b in self.causal_relations}
-        
-        # Tareas con alguna salida (aparecen como origen en relaciones causales)
-        tasks_with_output = {a for a, _ in self.causal_relations}
+        causal = self.causal_matrix
         
-        # Las tareas de entrada son las que no tienen ninguna entrada
-        self.entry_tasks = sorted(all_tasks - tasks_with_input)
+        # Las tareas de entrada son las que no tienen ninguna entrada (columna causal vacía)
+        self.entry_tasks = sorted(self._names(np.flatnonzero(~causal.any(axis=0))))
         
-        # Las tareas de salida son las que no tienen ninguna salida
-        self.exit_tasks = sorted(all_tasks - tasks_with_output)
+        # Las tareas de salida son las que no tienen ninguna salida (fila causal vacía)
+        self.exit_tasks = sorted(self._names(np.flatnonzero(~causal.any(axis=1))))
         
         return self
     
     def create_footprint_matrix(self):
-        """Crea la matriz de huella del proceso"""
-        matrix = pd.DataFrame('', index=self.activity_set, columns=self.activity_set)
-        
-        # Rellenar la matriz según los tipos de relaciones
-        for a, b in self.causal_relations:
-            matrix.loc[a, b] = '->'
-            matrix.loc[b, a] = '<-'
-            
-        for a, b in self.concurrent_relations:
-            matrix.loc[a, b] = '||'
-            matrix.loc[b, a] = '||'
-            
-        for a, b in self.choice_relations:
-            matrix.loc[a, b] = '#'
-        
-        return matrix
+        """Devuelve la matriz de huella del proceso como DataFrame de pandas"""
+        return self.footprint.to_dataframe()
 
     def find_multiple_arrows_in_row(self, row, matrix):
         """Encuentra múltiples flechas salientes de una fila"""
-        targets = [col for col in self.activity_set if matrix.loc[row, col] == '->']
+        targets = self._names(np.nonzero(self._causal_mask(matrix)[self.activity_set.index(row)])[0])
         return (row, targets) if len(targets) > 1 else None
     
     def find_multiple_arrows_in_column(self, column, matrix):
         """Encuentra múltiples flechas entrantes a una columna"""
-        sources = [row for row in self.activity_set if matrix.loc[row, column] == '->']
+        sources = self._names(np.nonzero(self._causal_mask(matrix)[:, self.activity_set.index(column)])[0])
         return (sources, column) if len(sources) > 1 else None
+
+    def find_split_and_join_patterns(self, matrix):
+        """Encuentra de una vez todas las divisiones (a → {b,c}) y uniones ({a,b} → c)"""
+        causal = self._causal_mask(matrix)
+
+        # Filas con más de una flecha saliente y columnas con más de una entrante
+        split_rows = np.nonzero(causal.sum(axis=1) > 1)[0]
+        join_cols = np.nonzero(causal.sum(axis=0) > 1)[0]
+
+        row_patterns = [(self.activity_set[i], self._names(np.nonzero(causal[i])[0])) for i in split_rows]
+        col_patterns = [(self._names(np.nonzero(causal[:, j])[0]), self.activity_set[j]) for j in join_cols]
+        return row_patterns, col_patterns
+
+    def _causal_mask(self, matrix):
+        """Máscara de las flechas '->' alineada con activity_set, de la huella o de su DataFrame"""
+        if isinstance(matrix, Footprint):
+            return matrix.codes == CAUSAL
+        # DataFrame de create_footprint_matrix(): celdas con símbolos
+        return matrix.loc[self.activity_set, self.activity_set].to_numpy() == SYMBOLS[CAUSAL]
+
+    def _names(self, ids):
+        """Traduce identificadores enteros a nombres de actividad"""
+        return [self.activity_set[i] for i in ids]
     
     def determine_pattern_type(self, pattern):
         """Determina si el patrón es de tipo Choice (#) o Paralelo (||)"""
@@ -225,19 +535,8 @@ class Alpha:
     
     def discover_complex_patterns(self):
         """Identifica patrones complejos en la matriz de huella"""
-        matrix = self.create_footprint_matrix()
-        row_patterns = []
-        col_patterns = []
-        
-        # Buscar patrones en filas y columnas
-        for activity in self.activity_set:
-            row_result = self.find_multiple_arrows_in_row(activity, matrix)
-            if row_result:
-                row_patterns.append(row_result)
-                
-            col_result = self.find_multiple_arrows_in_column(activity, matrix)
-            if col_result:
-                col_patterns.append(col_result)
+        # Buscar patrones en filas y columnas sobre la adyacencia causal
+        row_patterns, col_patterns = self.find_split_and_join_patterns(self.footprint)
         
         # Expandir patrones complejos a pares
         expanded_rows = self.expand_row_patterns(row_patterns)
@@ -279,25 +578,30 @@ class Alpha:
     
     def format_place_label(self, pattern):
         """Formatea un patrón como etiqueta legible de lugar"""
-        if isinstance(pattern[0], tuple):
-            return f"P({{{pattern[0][0]},{pattern[0][1]}}},{{{pattern[1]}}})"
-        elif isinstance(pattern[1], tuple):
-            return f"P({{{pattern[0]}}},{{{pattern[1][0]},{pattern[1][1]}}})"
-        return f"P({{{pattern[0]}}},{{{pattern[1]}}})"
+        inputs = ",".join(pattern[0]) if isinstance(pattern[0], tuple) else pattern[0]
+        outputs = ",".join(pattern[1]) if isinstance(pattern[1], tuple) else pattern[1]
+        return f"P({{{inputs}}},{{{outputs}}})"
     
+    @instrumented('generate_pattern_pairs')
     def generate_pattern_pairs(self):
-        # Iniciar con las relaciones causales directas
-        self.pattern_pairs = list(self.causal_relations)
-        
-        # Agregar los patrones complejos
-        self.pattern_pairs += self.discover_complex_patterns()
-        
+        # Pares elementales ({a},{b}) de X_L: las relaciones causales directas
+        self.pattern_pairs = sorted(self.causal_relations)
         return self
     
+    @instrumented('generate_maximal_patterns')
     def generate_maximal_patterns(self):
-        self.maximal_patterns = self.remove_simple_patterns(self.pattern_pairs)
+        # Enumerar directamente los pares maximales (A,B) de Y_L con conjuntos de bits
+        pairs = enumerate_maximal_pairs(self.causal_matrix, self.choice_matrix)
+        self.maximal_patterns = [(self._pattern_side(inputs), self._pattern_side(outputs))
+                                 for inputs, outputs in pairs]
         return self
+
+    def _pattern_side(self, ids):
+        """Una actividad suelta se guarda como nombre; varias, como tupla ordenada"""
+        names = self._names(ids)
+        return names[0] if len(names) == 1 else tuple(names)
     
+    @instrumented('generate_place_labels')
     def generate_place_labels(self):
         # Convertir patrones a lugares formalizados
         self.places = []
@@ -332,6 +636,7 @@ class Alpha:
         
         return self
     
+    @instrumented('generate_flow_relations')
     def generate_flow_relations(self):
         self.flow_relations = []
         
@@ -340,26 +645,283 @@ class Alpha:
             place_id = f"p{idx}"
             
             # Conexiones de entrada al lugar
-            for input_act in inputs:
+            for input_act in sorted(inputs):
                 if input_act != "Il":  # Ignorar la fuente lógica
                     self.flow_relations.append((input_act, place_id))
             
             # Conexiones de salida del lugar
-            for output_act in outputs:
+            for output_act in sorted(outputs):
                 if output_act != "Ol":  # Ignorar el sumidero lógico
                     self.flow_relations.append((place_id, output_act))
         
         return self
     
+    @instrumented('execute_alpha_algorithm')
     def execute_alpha_algorithm(self):
+        # El modelo recuperado de la caché ya incluye los lugares y flujos
+        if self.cache_hit:
+            return self
+
         self.generate_pattern_pairs()
         self.generate_maximal_patterns()
         self.generate_place_labels()
         self.generate_flow_relations()
         self.places = [(sorted(list(inputs)), sorted(list(outputs))) for inputs, outputs in self.places]
+
+        if self.cache is not None and self.fingerprint is not None:
+            self.cache.put(self.fingerprint, self._snapshot_state())
         
         return self
+
+    def to_dict(self, include_footprint=False):
+        """Resumen estructurado del modelo minado (apto para JSON)"""
+        summary = {
+            'activities': list(self.activity_set),
+            'entry_tasks': list(self.entry_tasks),
+            'exit_tasks': list(self.exit_tasks),
+            'places': [{'id': f"p{idx}", 'inputs': list(inputs), 'outputs': list(outputs)}
+                       for idx, (inputs, outputs) in enumerate(self.places)],
+            'flow_relations': [[src, dst] for src, dst in self.flow_relations],
+        }
+        if include_footprint:
+            summary['footprint'] = self.footprint.to_lists()
+        if self.thresholds():
+            summary['thresholds'] = self.thresholds()
+            summary['pruned'] = dict(self.pruned)
+        if self.sampling is not None:
+            summary['sampling'] = dict(self.sampling)
+        return summary
+
+    def stream(self, **options):
+        """Ensamblador de trazas que alimenta este minero desde un flujo de eventos (ver TraceAssembler)"""
+        from stream import TraceAssembler
+
+        return TraceAssembler(self, **options)
+
+    @instrumented('replay')
+    def replay(self, traces=None):
+        """Token replay de unas trazas (por defecto, el propio log) sobre la red descubierta"""
+        from conformance import TokenReplay
+
+        return TokenReplay(self).replay(self.variants if traces is None else traces)
+
+    def save(self, path, include_variants=True):
+        """Guarda el modelo minado en formato binario (ver model_format)"""
+        from model_format import save_model
+
+        save_model(self, path, include_variants)
+        return self
+
+    @classmethod
+    def load(cls, path, cache=None, mmap=True, variants=True):
+        """Crea un minero a partir de un modelo guardado con save(), listo para add_traces()"""
+        from model_format import load_model
+
+        return load_model(path, cls(cache=cache), mmap, variants)
+
+    def _snapshot_state(self):
+        """Estado minado como diccionario de atributos"""
+        return {name: getattr(self, name) for name in MINED_STATE}
+
+    def _restore_state(self, state):
+        for name in MINED_STATE:
+            setattr(self, name, state[name])
+        return self
+
+    @instrumented('add_traces')
+    def add_traces(self, traces):
+        """Añade trazas nuevas a un minero ya ejecutado sin recalcular todo el log.
+
+        Acepta una lista de trazas o un diccionario traza -> frecuencia. Las
+        sucesiones se suman a la matriz existente y se anotan los pares que
+        pasan de cero a positivo (o, con umbrales, los que pueden cruzarlos);
+        update() aplica después los cambios.
+        """
+        batch = Counter()
+        items = traces.items() if hasattr(traces, 'items') else ((trace, 1) for trace in traces)
+        for trace, count in items:
+            if count > 0:
+                batch[tuple(trace)] += count
+        self.variants.update(batch)
+
+        # Sin una minería previa no hay estado que actualizar: update() lo hará completo
+        if not self.places:
+            return self
+
+        new_activities = {act for trace in batch for act in trace} - set(self.activity_index)
+        if new_activities:
+            self._extend_activities(new_activities)
+
+        sources, targets, weights = self._encode_successions(batch)
+        if len(sources):
+            # Pares que pasan de cero a positivo cambian la clasificación de sus celdas
+            newly = self.succession_matrix[sources, targets] == 0
+            np.add.at(self.succession_matrix, (sources, targets), weights)
+            names = self.activity_set
+            if self.thresholds():
+                # Con umbrales cualquier aumento puede cruzarlos; el relativo depende de toda la fila
+                newly[:] = True
+                if self.min_relative:
+                    for a in np.unique(sources).tolist():
+                        for b in np.nonzero(self.succession_matrix[a])[0].tolist():
+                            self._pending_cells.add((names[a], names[b]))
+            for a, b in set(zip(sources[newly].tolist(), targets[newly].tolist())):
+                self._pending_cells.add((names[a], names[b]))
+            # Si aún no se han derivado de la matriz, ya incluirán las trazas nuevas
+            successions = self._direct_successions
+            if successions is not None:
+                for a, b, count in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+                    pair = (names[a], names[b])
+                    successions[pair] = successions.get(pair, 0) + count
+
+        return self
+
+    def _extend_activities(self, new_activities):
+        """Reindexa la matriz de sucesiones y la huella al aparecer actividades nuevas"""
+        self._new_activities |= new_activities
+        activity_set = sorted(set(self.activity_set) | new_activities)
+        size = len(activity_set)
+        position = {act: i for i, act in enumerate(activity_set)}
+        old = np.array([position[act] for act in self.activity_set], dtype=np.intp)
+        cells = np.ix_(old, old)
+
+        def expand(matrix, fill):
+            expanded = np.full((size, size), fill, dtype=matrix.dtype)
+            expanded[cells] = matrix
+            return expanded
+
+        self.succession_matrix = expand(self.succession_matrix, 0)
+        # Las relaciones de las actividades nuevas con las existentes son # por defecto
+        codes = expand(self.footprint.codes, CHOICE)
+
+        self.activity_set = activity_set
+        self.activity_index = {act: i for i, act in enumerate(activity_set)}
+        self.footprint = Footprint(activity_set, codes)
+        return self
+
+    @instrumented('update')
+    def update(self):
+        """Aplica las trazas añadidas: recalcula solo las celdas y lugares afectados.
+
+        Deja en last_update las actividades nuevas, las celdas de la huella
+        que cambian (a, b, símbolo anterior, símbolo nuevo) y los lugares
+        añadidos y eliminados.
+        """
+        old_places = [(tuple(inputs), tuple(outputs)) for inputs, outputs in self.places]
+        self.cache_hit = False
+        self.fingerprint = None
+
+        if not old_places:
+            # Primera minería: no hay estado previo que aprovechar
+            self.discover_relations().execute_alpha_algorithm()
+            new_activities = set(self.activity_set)
+            names = self.activity_set
+            changed = [(names[a], names[b], SYMBOLS[CHOICE], SYMBOLS[self.footprint.codes[a, b]])
+                       for a, b in zip(*np.nonzero(self.footprint.codes != CHOICE))]
+        else:
+            new_activities = self._new_activities
+            changed = self._update_cells()
+            self._count_pruned()
+            affected = {a for a, b, _, _ in changed} | {b for a, b, _, _ in changed} | new_activities
+            if affected:
+                self._identify_boundary_tasks()
+                self._update_maximal_patterns(affected)
+                self.generate_pattern_pairs()
+                self.generate_place_labels()
+                self.generate_flow_relations()
+                self.places = [(sorted(inputs), sorted(outputs)) for inputs, outputs in self.places]
+
+        new_places = [(tuple(inputs), tuple(outputs)) for inputs, outputs in self.places]
+        self.last_update = {
+            'new_activities': sorted(new_activities),
+            'changed_cells': changed,
+            'added_places': [place for place in new_places if place not in old_places],
+            'removed_places': [place for place in old_places if place not in new_places],
+        }
+        self._pending_cells = set()
+        self._new_activities = set()
+        return self
+
+    def _update_cells(self):
+        """Reclasifica las celdas (a,b) y (b,a) de los pares pendientes"""
+        if not self._pending_cells:
+            return []
+
+        index = self.activity_index
+        cells = {(index[a], index[b]) for a, b in self._pending_cells}
+        cells |= {(b, a) for a, b in cells}
+        rows, cols = (np.array(ids, dtype=np.intp) for ids in zip(*sorted(cells)))
+        old_codes = self.footprint.codes[rows, cols].copy()
+
+        follows = self._follows(rows, cols)
+        reverse = self._follows(cols, rows)
+        reflexive = rows == cols
+
+        # Las vistas de relaciones leen la huella, así que basta con reescribir sus códigos
+        codes = np.full(len(rows), CHOICE, dtype=np.int8)
+        codes[follows & ~reverse & ~reflexive] = CAUSAL
+        codes[~follows & reverse & ~reflexive] = REVERSE
+        codes[follows & reverse & ~reflexive] = PARALLEL
+        self.footprint.codes[rows, cols] = codes
+
+        names = self.activity_set
+        return [(names[a], names[b], SYMBOLS[old], SYMBOLS[new])
+                for a, b, old, new in zip(rows.tolist(), cols.tolist(), old_codes.tolist(), codes.tolist())
+                if old != new]
+
+    def _update_maximal_patterns(self, affected):
+        """Recalcula solo los pares maximales que contienen actividades afectadas.
+
+        La validez y maximalidad de un par que no toca actividades afectadas
+        no cambia salvo que lo absorba un par nuevo, y todo par con una
+        actividad afectada x vive en el vecindario a dos saltos causales de x.
+        """
+        index = self.activity_index
+        affected_ids = np.array(sorted(index[act] for act in affected), dtype=np.intp)
+        causal = self.causal_matrix
+
+        near = np.zeros(len(self.activity_set), dtype=bool)
+        near[affected_ids] = True
+        successors = causal[affected_ids].any(axis=0)
+        predecessors = causal[:, affected_ids].any(axis=1)
+        near |= successors | predecessors
+        near |= causal[:, successors].any(axis=1) | causal[predecessors].any(axis=0)
+        local = np.nonzero(near)[0]
+        cells = np.ix_(local, local)
+
+        is_affected = np.zeros(len(self.activity_set), dtype=bool)
+        is_affected[affected_ids] = True
+        new_pairs = []
+        choice = self.footprint.codes[cells] == CHOICE
+        for inputs, outputs in enumerate_maximal_pairs(causal[cells], choice):
+            inputs, outputs = local[list(inputs)], local[list(outputs)]
+            if is_affected[inputs].any() or is_affected[outputs].any():
+                new_pairs.append((tuple(inputs.tolist()), tuple(outputs.tolist())))
+
+        def as_sets(pattern):
+            return tuple(set(side) if isinstance(side, tuple) else {side} for side in pattern)
+
+        new_sets = [(set(self._names(a)), set(self._names(b))) for a, b in new_pairs]
+        kept = []
+        for pattern in self.maximal_patterns:
+            inputs, outputs = as_sets(pattern)
+            if inputs & affected or outputs & affected:
+                continue
+            if any(inputs <= a and outputs <= b for a, b in new_sets):
+                continue
+            kept.append(pattern)
+
+        kept += [(self._pattern_side(a), self._pattern_side(b)) for a, b in new_pairs]
+        self.maximal_patterns = sorted(kept, key=lambda pattern: tuple(map(sorted, as_sets(pattern))))
+        return self
     
+    def render(self, target, format=None):
+        """Escribe la red de Petri en DOT o SVG sin matplotlib ni networkx (ver petri_render)"""
+        from petri_render import render
+
+        render(self, target, format)
+        return self
+
     def visualize_petri_net(self):
         """Genera una visualización de la red de Petri completa usando NetworkX"""
         try:
@@ -369,6 +931,7 @@ class Alpha:
             print("Error: Las bibliotecas NetworkX y/o Matplotlib no están instaladas.")
             print("Instálalas con 'pip install networkx matplotlib'.")
             return None
+        from petri_render import layered_layout
         
         # Crear un grafo dirigido
         G = nx.DiGraph()
@@ -404,8 +967,9 @@ class Alpha:
         # Agregar aristas al grafo
         G.add_edges_from([(u, v) for u, v, _ in edges])
         
-        # Posicionar los nodos (usar posicionamiento jerárquico para mejor flujo)
-        pos = nx.spring_layout(G, seed=42)  # Usar una semilla fija para reproducibilidad
+        # Posicionar los nodos por capas de izquierda a derecha (determinista y lineal)
+        pos = {node: (layer, -row) for node, (layer, row) in layered_layout(self).items()}
+        G.add_nodes_from(pos)
         
         # Crear una nueva figura y ejes
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -445,6 +1009,13 @@ class Alpha:
         return fig
 
 if __name__ == "__main__":
+    import sys
+
+    # Con argumentos se comporta como CLI: python -m alpha mine --input log.txt
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main())
+
     # Ejemplo de uso de ProcessMiner
     print("=== DEMOSTRACIÓN DE PROCESS MINER ===")
     
@@ -465,7 +1036,7 @@ if __name__ == "__main__":
     
     # Mostrar matriz de huella
     print("\nMatriz de huella del proceso:")
-    print(miner.create_footprint_matrix())
+    print(miner.footprint.to_text())
     
     # Mostrar lugares descubiertos
     print("\nLugares en la red de Petri:")
@@ -0,0 +1,102 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+import argparse
+import json
+import os
+import pathlib
+import sys
+
+from alpha import Alpha
+
+
+def mine_log(source, include_footprint=False, thresholds=None):
+    """Mina un log (texto o ruta de fichero) y devuelve el modelo como diccionario"""
+    alpha = Alpha(**(thresholds or {}))
+    if isinstance(source, os.PathLike):
+        alpha.parse_event_log_file(source)
+    else:
+        alpha.parse_event_log(source)
+    return alpha.discover_relations().execute_alpha_algorithm().to_dict(include_footprint)
+
+
+def _mine_item(item, include_footprint=False, thresholds=None):
+    """Tarea de un proceso trabajador: aísla los errores de cada log"""
+    name, source = item
+    try:
+        return {'name': name, 'ok': True, 'model': mine_log(source, include_footprint, thresholds)}
+    except Exception as e:
+        return {'name': name, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+
+def _named_items(logs):
+    """Normaliza la entrada a pares (nombre, origen)"""
+    items = logs.items() if hasattr(logs, 'items') else enumerate(logs)
+    for name, source in items:
+        if isinstance(source, os.PathLike) and isinstance(name, int):
+            name = os.fspath(source)
+        yield str(name), source
+
+
+def iter_mine_batch(logs, workers=None, chunksize=1, include_footprint=False, thresholds=None):
+    """Mina muchos logs en paralelo y genera los resultados en el orden de entrada.
+
+    logs puede ser una lista de textos de log o rutas (pathlib.Path) o un
+    diccionario nombre -> log. Cada resultado es un diccionario con 'name',
+    'ok' y 'model' o 'error'; un log inválido no interrumpe el lote.
+    include_footprint y thresholds (min_count, min_relative, min_dependency)
+    se aplican a todos los logs como en mine_log.
+    """
+    items = list(_named_items(logs))
+    task = partial(_mine_item, include_footprint=include_footprint, thresholds=thresholds)
+    if workers == 1:
+        yield from map(task, items)
+        return
+
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(task, items, chunksize=chunksize):
+                done += 1
+                yield result
+    except BrokenProcessPool as e:
+        # Un trabajador murió: marcar los logs pendientes como fallidos
+        for name, _ in items[done:]:
+            yield {'name': name, 'ok': False, 'error': f"BrokenProcessPool: {e}"}
+
+
+def mine_batch(logs, workers=None, chunksize=1, include_footprint=False, thresholds=None):
+    """Versión de iter_mine_batch que devuelve la lista completa de resultados"""
+    return list(iter_mine_batch(logs, workers, chunksize, include_footprint, thresholds))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mina en paralelo muchos logs con el algoritmo Alpha")
+    parser.add_argument('inputs', nargs='+', type=pathlib.Path, help="ficheros de log [<a,b>^n, ...]")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="procesos trabajadores (por defecto, núcleos)")
+    parser.add_argument('-c', '--chunksize', type=int, default=1, help="logs enviados a cada trabajador por tarea")
+    parser.add_argument('-o', '--output', type=pathlib.Path, default=None, help="fichero NDJSON de salida (por defecto, stdout)")
+    parser.add_argument('--footprint', action='store_true', help="incluir la matriz de huella en cada modelo")
+    parser.add_argument('--min-count', type=int, default=1, help="apariciones mínimas de a>b para contarla")
+    parser.add_argument('--min-relative', type=float, default=0.0,
+                        help="fracción mínima de a>b sobre las sucesiones que salen de a")
+    parser.add_argument('--min-dependency', type=float, default=None,
+                        help="descarta a>b si la dependencia de b sobre a alcanza este valor (0-1)")
+    args = parser.parse_args(argv)
+    thresholds = {'min_count': args.min_count, 'min_relative': args.min_relative,
+                  'min_dependency': args.min_dependency}
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    failures = 0
+    try:
+        for result in iter_mine_batch(args.inputs, args.workers, args.chunksize, args.footprint, thresholds):
+            failures += not result['ok']
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            output.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
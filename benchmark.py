@@ -0,0 +1,142 @@
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from alpha import Alpha
+from log_generator import format_log, generate_variants
+
+# Casos predefinidos: actividades, variantes, longitud máxima y multiplicidad
+CASES = {
+    'small': dict(n_activities=10, n_variants=20, max_trace_length=30, multiplicity=10),
+    'medium': dict(n_activities=50, n_variants=500, max_trace_length=100, multiplicity=1000),
+    'large': dict(n_activities=200, n_variants=5000, max_trace_length=300, multiplicity=100000),
+    # Sin bucles: con 1000 actividades el número de lugares maximales de Alpha explota
+    'wide': dict(n_activities=1000, n_variants=1000, max_trace_length=1500, multiplicity=10,
+                 operators=['seq', 'xor', 'and']),
+}
+
+STAGES = ('parse_event_log', 'discover_relations', 'execute_alpha_algorithm')
+
+
+def _run_stages(log_string, measure_memory=False):
+    """Ejecuta el pipeline y devuelve (tiempos, picos de memoria, minero)"""
+    alpha = Alpha()
+    calls = (
+        lambda: alpha.parse_event_log(log_string),
+        alpha.discover_relations,
+        alpha.execute_alpha_algorithm,
+    )
+    times, peaks = {}, {}
+    for stage, call in zip(STAGES, calls):
+        if measure_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        call()
+        times[stage] = time.perf_counter() - start
+        if measure_memory:
+            peaks[stage] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return times, peaks, alpha
+
+
+def run_case(name, params, repeat=3, seed=0):
+    """Mide un caso: mejor tiempo de cada etapa y pico de memoria por etapa.
+
+    Los tiempos se toman sin tracemalloc; la memoria se mide en una pasada
+    adicional para no contaminar las mediciones de tiempo.
+    """
+    variants = generate_variants(seed=seed, **params)
+    log_string = format_log(variants)
+
+    best = {stage: float('inf') for stage in STAGES}
+    for _ in range(repeat):
+        times, _, alpha = _run_stages(log_string)
+        for stage in STAGES:
+            best[stage] = min(best[stage], times[stage])
+    _, peaks, _ = _run_stages(log_string, measure_memory=True)
+
+    return {
+        'case': name,
+        'params': json.loads(json.dumps(dict(params, seed=seed))),
+        'seconds': best,
+        'total_seconds': sum(best.values()),
+        'peak_bytes': peaks,
+        'sizes': {
+            'activities': len(alpha.activity_set),
+            'variants': len(alpha.variants),
+            'traces': sum(alpha.variants.values()),
+            'events': sum(len(trace) * count for trace, count in alpha.variants.items()),
+            'log_bytes': len(log_string.encode('utf-8')),
+            'places': len(alpha.places),
+        },
+    }
+
+
+def run_suite(cases=('small', 'medium'), repeat=3, seed=0):
+    """Ejecuta varios casos y devuelve un informe comparable entre ejecuciones"""
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': [run_case(name, CASES[name], repeat, seed) for name in cases],
+    }
+
+
+def compare(baseline, current, tolerance=1.25):
+    """Lista las etapas cuyo tiempo empeora más que tolerance frente a la línea base"""
+    previous = {result['case']: result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get(result['case'])
+        if old is None or old['params'] != result['params']:
+            continue
+        for stage in STAGES:
+            before, after = old['seconds'][stage], result['seconds'][stage]
+            if before > 0 and after / before > tolerance:
+                regressions.append({'case': result['case'], 'stage': stage,
+                                    'before': before, 'after': after, 'ratio': after / before})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline del algoritmo Alpha")
+    parser.add_argument('--cases', default='small,medium', help=f"casos separados por comas: {', '.join(CASES)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="guarda el informe en JSON")
+    parser.add_argument('--baseline', help="informe anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=1.25, help="cociente de tiempo tolerado antes de avisar")
+    args = parser.parse_args(argv)
+
+    report = run_suite([name.strip() for name in args.cases.split(',')], args.repeat, args.seed)
+    for result in report['results']:
+        stages = "  ".join(f"{stage}={result['seconds'][stage] * 1000:.1f}ms" for stage in STAGES)
+        peak = max(result['peak_bytes'].values()) / (1024 * 1024)
+        print(f"{result['case']:>8}: {stages}  pico={peak:.1f}MiB  {result['sizes']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            regressions = compare(json.load(handle), report, args.tolerance)
+        for item in regressions:
+            print(f"REGRESIÓN {item['case']}/{item['stage']}: {item['before'] * 1000:.1f}ms -> "
+                  f"{item['after'] * 1000:.1f}ms (x{item['ratio']:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
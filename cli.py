@@ -0,0 +1,338 @@
+import argparse
+import json
+import pathlib
+import sys
+
+from alpha import Alpha
+
+
+def _input_format(source, requested):
+    """Formato de entrada explícito o deducido de la extensión del fichero"""
+    if requested != 'auto':
+        return requested
+    suffix = pathlib.Path(source).suffix.lower()
+    return {'.xes': 'xes', '.csv': 'csv', '.alpham': 'model'}.get(suffix, 'log')
+
+
+def _read_log(alpha, source, args, input_format):
+    """Carga en alpha las variantes de un log (texto, XES o CSV) sin minarlo"""
+    stream = sys.stdin.buffer if source == '-' else pathlib.Path(source)
+    if input_format == 'xes':
+        alpha.import_xes(stream, lifecycle=args.lifecycle)
+    elif input_format == 'csv':
+        alpha.import_csv(stream, case_column=args.case_column, activity_column=args.activity_column,
+                         timestamp_column=args.timestamp_column, delimiter=args.delimiter)
+    elif input_format == 'model':
+        raise ValueError(f"{source}: se esperaba un log de eventos, no un modelo binario")
+    else:
+        alpha.parse_event_log_file(stream)
+    return alpha
+
+
+def _read_model(source, args, input_format=None):
+    """Mina un log desde una ruta o '-' (entrada estándar), o carga un modelo binario"""
+    alpha = Alpha(min_count=args.min_count, min_relative=args.min_relative, min_dependency=args.min_dependency)
+    if args.profile:
+        alpha.enable_instrumentation()
+
+    input_format = _input_format(source, input_format or args.input_format)
+    if input_format == 'model':
+        if source == '-':
+            raise ValueError("un modelo binario debe leerse de un fichero, no de stdin")
+        return Alpha.load(source)
+    if args.sample:
+        # Minería aproximada: se lee solo la parte del log necesaria para que el soporte converja
+        options = {'confidence': args.confidence, 'patience': args.patience, 'order': args.sample_order,
+                   'seed': args.seed}
+        if input_format == 'log' and source != '-':
+            return alpha.discover_relations_sampled(source, **options).execute_alpha_algorithm()
+        return _read_log(alpha, source, args, input_format).discover_relations_sampled(**options) \
+            .execute_alpha_algorithm()
+    if input_format == 'log' and args.workers and args.workers > 1 and source != '-':
+        # Cada proceso lee y cuenta su propio rango de bytes del fichero
+        return alpha.discover_relations_parallel(source, workers=args.workers).execute_alpha_algorithm()
+    return _read_log(alpha, source, args, input_format).discover_relations().execute_alpha_algorithm()
+
+
+def _format_text(name, alpha):
+    lines = [f"=== {name} ===",
+             f"Actividades: {alpha.activity_set}",
+             f"Tareas iniciales: {alpha.entry_tasks}",
+             f"Tareas finales: {alpha.exit_tasks}",
+             "",
+             "Matriz de huella:",
+             alpha.footprint.to_text(),
+             "",
+             "Lugares identificados:"]
+    for idx, (inputs, outputs) in enumerate(alpha.places):
+        lines.append(f"p{idx}: {{{', '.join(inputs)}}} → {{{', '.join(outputs)}}}")
+    return "\n".join(lines) + "\n"
+
+
+def _numbered(path, idx, total):
+    """Con varias entradas, añade el índice al nombre del fichero de salida"""
+    target = pathlib.Path(path)
+    if total > 1:
+        target = target.with_name(f"{target.stem}_{idx}{target.suffix}")
+    return target
+
+
+def _render(alpha, path):
+    """Guarda la red de Petri: DOT/SVG directamente, otros formatos con matplotlib"""
+    if path.suffix.lower() in ('.svg', '.dot', '.gv'):
+        alpha.render(path)
+        return
+    # Solo aquí se cargan las librerías gráficas
+    import matplotlib
+    matplotlib.use('Agg')
+
+    fig = alpha.visualize_petri_net()
+    if fig is None:
+        raise RuntimeError("No se pudo generar la visualización (faltan matplotlib/networkx)")
+    fig.savefig(path)
+
+
+def command_mine(args):
+    inputs = args.input or ['-']
+    records = []
+    for idx, source in enumerate(inputs):
+        alpha = _read_model(source, args)
+        if args.profile:
+            print(json.dumps({'name': source, **alpha.stage_report()}), file=sys.stderr)
+        if args.render:
+            _render(alpha, _numbered(args.render, idx, len(inputs)))
+        if args.save:
+            alpha.save(_numbered(args.save, idx, len(inputs)))
+
+        if args.format == 'text':
+            records.append(_format_text(source, alpha))
+        else:
+            records.append({'name': source, **alpha.to_dict(include_footprint=True)})
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.format == 'text':
+            output.write("\n".join(records))
+        elif args.format == 'ndjson':
+            for record in records:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            document = records[0] if len(records) == 1 else records
+            output.write(json.dumps(document, ensure_ascii=False, indent=2) + "\n")
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+def command_replay(args):
+    model = _read_model(args.model, args, 'auto')
+    traces = _read_log(Alpha(), args.input, args, _input_format(args.input, args.input_format))
+    result = model.replay(traces.variants)
+    document = {'model': args.model, 'input': args.input, 'log': result['log']}
+    if args.variants:
+        document['variants'] = result['variants']
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        output.write(json.dumps(document, ensure_ascii=False, indent=2) + "\n")
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+def command_stream(args):
+    """Lee eventos CSV (caso, actividad, marca) y escribe el modelo en NDJSON cada --every trazas"""
+    import csv
+
+    alpha = Alpha(min_count=args.min_count, min_relative=args.min_relative, min_dependency=args.min_dependency)
+    assembler = alpha.stream(end_activities=args.end_activity or (), timeout=args.timeout,
+                             max_open_cases=args.max_open_cases, batch_size=args.every or 1000)
+    handle = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', newline='')
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    def emit():
+        model = assembler.model()
+        record = {'stats': assembler.stats(), **model.to_dict()}
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    try:
+        reader = csv.reader(handle, delimiter=args.delimiter)
+        header = next(reader, None) or []
+        try:
+            case_idx, activity_idx = header.index(args.case_column), header.index(args.activity_column)
+        except ValueError:
+            raise ValueError(f"El CSV debe tener las columnas '{args.case_column}' y '{args.activity_column}'; "
+                             f"encontradas: {header}") from None
+        time_idx = header.index(args.timestamp_column) if args.timestamp_column in header else None
+
+        reported = 0
+        for row in reader:
+            if not row:
+                continue
+            assembler.push(row[case_idx], row[activity_idx], row[time_idx] if time_idx is not None else None)
+            if args.every and assembler.completed - reported >= args.every:
+                reported = assembler.completed
+                emit()
+        assembler.flush()
+        emit()
+    finally:
+        if args.input != '-':
+            handle.close()
+        if args.output:
+            output.close()
+    return 0
+
+
+def command_drift(args):
+    """Mina cada ventana y escribe en NDJSON las diferencias entre ventanas consecutivas"""
+    from drift import FootprintSeries
+
+    thresholds = {'min_count': args.min_count, 'min_relative': args.min_relative,
+                  'min_dependency': args.min_dependency}
+    windows = [pathlib.Path(source).read_text(encoding='utf-8') for source in args.input]
+    series = FootprintSeries.from_logs(windows, names=args.input, workers=args.workers, **thresholds)
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for diff in series.consecutive():
+            diff['drift'] = diff['conformance'] < args.threshold
+            output.write(json.dumps(diff, ensure_ascii=False) + "\n")
+        if args.matrix:
+            output.write(json.dumps({'windows': args.input,
+                                     'conformance_matrix': series.conformance_matrix().tolist()}) + "\n")
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+def command_batch(args):
+    from batch import main as batch_main
+    return batch_main(args.arguments)
+
+
+def command_serve(args):
+    from service import main as service_main
+    return service_main(args.arguments)
+
+
+def command_import_budget(args):
+    from import_budget import main as budget_main
+    return budget_main(args.arguments)
+
+
+def _add_log_options(parser):
+    """Opciones de lectura de logs compartidas por los subcomandos"""
+    parser.add_argument('--input-format', choices=('auto', 'log', 'xes', 'csv', 'model'), default='auto',
+                        help="formato de entrada; 'auto' lo deduce de la extensión (.xes, .csv, .alpham)")
+    parser.add_argument('--case-column', default='case_id', help="columna del caso en CSV")
+    parser.add_argument('--activity-column', default='activity', help="columna de la actividad en CSV")
+    parser.add_argument('--timestamp-column', default='timestamp', help="columna de la marca de tiempo en CSV")
+    parser.add_argument('--delimiter', default=',', help="separador del CSV")
+    parser.add_argument('--lifecycle', default=None, help="en XES, conservar solo esta transición (p. ej. complete)")
+
+
+def _add_threshold_options(parser):
+    """Umbrales de ruido aplicados a las sucesiones directas al minar"""
+    parser.add_argument('--min-count', type=int, default=1, help="apariciones mínimas de a>b para contarla")
+    parser.add_argument('--min-relative', type=float, default=0.0,
+                        help="fracción mínima de a>b sobre las sucesiones que salen de a")
+    parser.add_argument('--min-dependency', type=float, default=None,
+                        help="descarta a>b si la dependencia de b sobre a alcanza este valor (0-1)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m alpha", description="Algoritmo Alpha sin menús interactivos")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    mine = commands.add_parser('mine', help="mina uno o varios logs y escribe el modelo")
+    mine.add_argument('-i', '--input', action='append', help="fichero de log ('-' para stdin); repetible")
+    mine.add_argument('-f', '--format', choices=('json', 'ndjson', 'text'), default='json')
+    _add_log_options(mine)
+    _add_threshold_options(mine)
+    mine.add_argument('-o', '--output', help="fichero de salida (por defecto, stdout)")
+    mine.add_argument('--render', help="guarda además la red de Petri (.svg/.dot sin dependencias; otros formatos "
+                           "requieren matplotlib y networkx)")
+    mine.add_argument('--save', help="guarda además el modelo minado en formato binario (.alpham)")
+    mine.add_argument('-w', '--workers', type=int, default=None,
+                      help="procesos para contar sucesiones de logs [<a,b>^n] grandes en paralelo")
+    mine.add_argument('--profile', action='store_true', help="escribe en stderr el informe de tiempos por etapa")
+    mine.add_argument('--sample', action='store_true',
+                      help="minería aproximada: para de leer cuando las sucesiones directas convergen")
+    mine.add_argument('--confidence', type=float, default=0.99,
+                      help="con --sample, para cuando los pares nuevos esperados en la siguiente entrada "
+                           "(cota de la probabilidad de ver alguno) son como mucho 1 - confidence")
+    mine.add_argument('--patience', type=int, default=None,
+                      help="con --sample, para tras N lotes seguidos sin sucesiones nuevas")
+    mine.add_argument('--sample-order', choices=('stratified', 'random'), default='stratified',
+                      help="orden en que se leen las trazas con --sample")
+    mine.add_argument('--seed', type=int, default=None, help="semilla del muestreo")
+    mine.set_defaults(handler=command_mine)
+
+    replay = commands.add_parser('replay', help="token replay de un log sobre un modelo (fitness)")
+    replay.add_argument('-m', '--model', required=True, help="modelo: log a minar o fichero binario .alpham")
+    replay.add_argument('-i', '--input', default='-', help="log con las trazas a comprobar ('-' para stdin)")
+    _add_log_options(replay)
+    _add_threshold_options(replay)
+    replay.add_argument('--variants', action='store_true', help="incluye el resultado de cada variante")
+    replay.add_argument('-o', '--output', help="fichero de salida (por defecto, stdout)")
+    replay.set_defaults(handler=command_replay, workers=None, profile=False, sample=False)
+
+    stream = commands.add_parser('stream', help="minería en línea de un flujo CSV de eventos intercalados por caso")
+    stream.add_argument('-i', '--input', default='-', help="CSV de eventos ('-' para stdin)")
+    stream.add_argument('--case-column', default='case_id', help="columna del caso")
+    stream.add_argument('--activity-column', default='activity', help="columna de la actividad")
+    stream.add_argument('--timestamp-column', default='timestamp', help="columna de la marca de tiempo")
+    stream.add_argument('--delimiter', default=',', help="separador del CSV")
+    stream.add_argument('--end-activity', action='append', help="actividad que termina un caso; repetible")
+    stream.add_argument('--timeout', type=float, default=None, help="segundos de inactividad que cierran un caso")
+    stream.add_argument('--max-open-cases', type=int, default=None,
+                        help="casos abiertos como máximo; se descartan los inactivos desde hace más tiempo")
+    stream.add_argument('--every', type=int, default=None, help="escribe el modelo cada N trazas completadas")
+    _add_threshold_options(stream)
+    stream.add_argument('-o', '--output', help="fichero de salida NDJSON (por defecto, stdout)")
+    stream.set_defaults(handler=command_stream)
+
+    drift = commands.add_parser('drift', help="compara las huellas de ventanas consecutivas de un log")
+    drift.add_argument('-i', '--input', action='append', required=True,
+                       help="log [<a,b>^n] de una ventana, en orden; repetible")
+    drift.add_argument('--threshold', type=float, default=0.95,
+                       help="conformidad por debajo de la cual se marca deriva")
+    drift.add_argument('--matrix', action='store_true', help="añade la matriz de conformidad entre todas las ventanas")
+    drift.add_argument('-w', '--workers', type=int, default=None, help="procesos para minar las ventanas")
+    _add_threshold_options(drift)
+    drift.add_argument('-o', '--output', help="fichero de salida NDJSON (por defecto, stdout)")
+    drift.set_defaults(handler=command_drift)
+
+    # Estos subcomandos reenvían sus argumentos al script correspondiente
+    batch = commands.add_parser('batch', add_help=False, help="minería en paralelo de muchos ficheros (ver batch.py)")
+    batch.set_defaults(handler=command_batch, forward=True)
+
+    serve = commands.add_parser('serve', add_help=False, help="servicio HTTP local de minería (ver service.py)")
+    serve.set_defaults(handler=command_serve, forward=True)
+
+    budget = commands.add_parser('import-budget', add_help=False,
+                                 help="verifica el tiempo de importación (ver import_budget.py)")
+    budget.set_defaults(handler=command_import_budget, forward=True)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if getattr(args, 'forward', False):
+        args.arguments = extra
+    elif extra:
+        parser.error(f"argumentos no reconocidos: {' '.join(extra)}")
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+from collections import Counter
+
+import numpy as np
+
+# Número de variantes que se reproducen a la vez (filas de la matriz de marcados)
+DEFAULT_BATCH_SIZE = 4096
+
+
+def trace_fitness(missing, remaining, produced, consumed):
+    """Fitness de token replay: media de la proporción de fichas no faltantes y no sobrantes"""
+    missing_ratio = missing / consumed if consumed else 0.0
+    remaining_ratio = remaining / produced if produced else 0.0
+    return 0.5 * (1 - missing_ratio) + 0.5 * (1 - remaining_ratio)
+
+
+class TokenReplay:
+    """Reproducción de fichas sobre la red de Petri descubierta por Alpha.
+
+    La red se compila en matrices enteras de incidencia pre y post
+    (transición x lugar). Cada variante distinta se reproduce una sola vez y
+    las variantes se procesan por lotes de longitud parecida, avanzando un
+    evento por paso sobre todo el lote con operaciones vectorizadas. Las
+    actividades que no están en el modelo no mueven fichas, pero la traza se
+    marca como no ajustada.
+    """
+
+    def __init__(self, miner):
+        self.activities = list(miner.activity_set)
+        self.index = dict(miner.activity_index)
+        self.places = [(list(inputs), list(outputs)) for inputs, outputs in miner.places]
+        size, n_places = len(self.activities), len(self.places)
+
+        # La fila extra (índice size) no tiene arcos: relleno y actividades desconocidas
+        self.pre = np.zeros((size + 1, n_places), dtype=np.int32)
+        self.post = np.zeros((size + 1, n_places), dtype=np.int32)
+        self.initial_marking = np.zeros(n_places, dtype=np.int32)
+        self.final_marking = np.zeros(n_places, dtype=np.int32)
+        for place, (inputs, outputs) in enumerate(self.places):
+            for act in inputs:
+                if act in self.index:
+                    self.post[self.index[act], place] = 1
+                elif act == 'Il':
+                    self.initial_marking[place] = 1
+            for act in outputs:
+                if act in self.index:
+                    self.pre[self.index[act], place] = 1
+                elif act == 'Ol':
+                    self.final_marking[place] = 1
+
+        self.consumed_by = self.pre.sum(axis=1, dtype=np.int64)
+        self.produced_by = self.post.sum(axis=1, dtype=np.int64)
+
+    def _encode(self, trace):
+        unknown = len(self.activities)
+        return [self.index.get(act, unknown) for act in trace]
+
+    def replay_variants(self, variants, batch_size=DEFAULT_BATCH_SIZE):
+        """Reproduce un multiconjunto traza -> frecuencia.
+
+        Devuelve una lista, alineada con variants.items(), de diccionarios con
+        las fichas faltantes, sobrantes, producidas y consumidas, las
+        actividades desconocidas y el fitness de cada variante.
+        """
+        items = list(variants.items())
+        encoded = [self._encode(trace) for trace, _ in items]
+        unknown_id = len(self.activities)
+        counts = {name: np.zeros(len(items), dtype=np.int64)
+                  for name in ('missing', 'remaining', 'produced', 'consumed')}
+
+        # Agrupar variantes de longitud parecida para reducir el relleno
+        order = sorted(range(len(items)), key=lambda idx: len(encoded[idx]))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            length = len(encoded[batch[-1]])
+            events = np.full((len(batch), length), unknown_id, dtype=np.intp)
+            for row, idx in enumerate(batch):
+                events[row, :len(encoded[idx])] = encoded[idx]
+
+            marking = np.tile(self.initial_marking, (len(batch), 1))
+            missing = np.zeros(len(batch), dtype=np.int64)
+            produced = np.full(len(batch), int(self.initial_marking.sum()), dtype=np.int64)
+            consumed = np.zeros(len(batch), dtype=np.int64)
+            for step in range(length):
+                fired = events[:, step]
+                need = self.pre[fired]
+                # Fichas que faltan para disparar: se crean artificialmente
+                deficit = np.maximum(need - marking, 0)
+                missing += deficit.sum(axis=1)
+                marking += deficit - need + self.post[fired]
+                consumed += self.consumed_by[fired]
+                produced += self.produced_by[fired]
+
+            # Consumir la ficha del marcado final
+            deficit = np.maximum(self.final_marking - marking, 0)
+            missing += deficit.sum(axis=1)
+            marking += deficit - self.final_marking
+            consumed += int(self.final_marking.sum())
+
+            rows = np.array(batch, dtype=np.intp)
+            counts['missing'][rows] = missing
+            counts['remaining'][rows] = marking.sum(axis=1)
+            counts['produced'][rows] = produced
+            counts['consumed'][rows] = consumed
+
+        results = []
+        for idx, (trace, count) in enumerate(items):
+            record = {name: int(values[idx]) for name, values in counts.items()}
+            unknown = sum(1 for act in encoded[idx] if act == unknown_id)
+            record.update({
+                'trace': list(trace),
+                'count': count,
+                'unknown_activities': unknown,
+                'fitness': trace_fitness(record['missing'], record['remaining'],
+                                         record['produced'], record['consumed']),
+            })
+            record['fits'] = record['missing'] == 0 and record['remaining'] == 0 and unknown == 0
+            results.append(record)
+        return results
+
+    def replay(self, traces, batch_size=DEFAULT_BATCH_SIZE):
+        """Reproduce un log (lista de trazas o diccionario traza -> frecuencia).
+
+        Devuelve {'variants': resultados por variante, 'log': totales
+        ponderados por frecuencia y fitness del log}.
+        """
+        variants = Counter()
+        items = traces.items() if hasattr(traces, 'items') else ((trace, 1) for trace in traces)
+        for trace, count in items:
+            if count > 0:
+                variants[tuple(trace)] += count
+
+        results = self.replay_variants(variants, batch_size)
+        totals = {name: sum(record[name] * record['count'] for record in results)
+                  for name in ('missing', 'remaining', 'produced', 'consumed')}
+        traces_total = sum(record['count'] for record in results)
+        fitting = sum(record['count'] for record in results if record['fits'])
+        summary = dict(totals,
+                       traces=traces_total,
+                       variants=len(results),
+                       fitting_traces=fitting,
+                       fitting_ratio=fitting / traces_total if traces_total else 0.0,
+                       fitness=trace_fitness(totals['missing'], totals['remaining'],
+                                             totals['produced'], totals['consumed']))
+        return {'variants': results, 'log': summary}
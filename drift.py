@@ -0,0 +1,141 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from alpha import Alpha
+from footprint import CHOICE, SYMBOLS
+
+
+def window_summary(miner):
+    """Lo necesario de un minero ya ejecutado para comparar ventanas: (actividades, códigos, lugares)"""
+    places = frozenset((tuple(sorted(inputs)), tuple(sorted(outputs))) for inputs, outputs in miner.places)
+    return list(miner.activity_set), np.asarray(miner.footprint.codes, dtype=np.int8), places
+
+
+def mine_window(window, thresholds=None):
+    """Mina una ventana (texto de log, lista de trazas o diccionario traza -> frecuencia)"""
+    alpha = Alpha(**(thresholds or {}))
+    if isinstance(window, str):
+        alpha.parse_event_log(window)
+    else:
+        items = window.items() if hasattr(window, 'items') else Counter(map(tuple, window)).items()
+        for trace, count in items:
+            alpha.add_variant(trace, count)
+    return window_summary(alpha.discover_relations().execute_alpha_algorithm())
+
+
+def _mine_window_task(task):
+    return mine_window(*task)
+
+
+class FootprintSeries:
+    """Huellas de una serie de ventanas alineadas sobre un mismo índice de actividades.
+
+    Los códigos int8 de cada ventana se copian en una pila (ventanas x |A| x
+    |A|) indexada por la unión ordenada de actividades; una actividad que no
+    aparece en una ventana queda sin relaciones (#). Las diferencias y la
+    conformidad entre ventanas se calculan con operaciones vectorizadas
+    sobre esa pila.
+    """
+
+    def __init__(self, summaries, names=None):
+        summaries = list(summaries)
+        self.names = list(names) if names is not None else [str(idx) for idx in range(len(summaries))]
+        self.activities = sorted({act for activities, _, _ in summaries for act in activities})
+        index = {act: i for i, act in enumerate(self.activities)}
+        size = len(self.activities)
+
+        self.codes = np.full((len(summaries), size, size), CHOICE, dtype=np.int8)
+        self.present = np.zeros((len(summaries), size), dtype=bool)
+        self.places = []
+        for window, (activities, codes, places) in enumerate(summaries):
+            ids = np.array([index[act] for act in activities], dtype=np.intp)
+            self.codes[window][np.ix_(ids, ids)] = codes
+            self.present[window, ids] = True
+            self.places.append(places)
+
+    @classmethod
+    def from_miners(cls, miners, names=None):
+        return cls([window_summary(miner) for miner in miners], names)
+
+    @classmethod
+    def from_logs(cls, windows, names=None, workers=None, **thresholds):
+        """Mina cada ventana (en paralelo si workers > 1) y alinea sus huellas"""
+        tasks = [(window, thresholds) for window in windows]
+        if workers and workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                summaries = list(executor.map(_mine_window_task, tasks))
+        else:
+            summaries = [mine_window(*task) for task in tasks]
+        return cls(summaries, names)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def changed_cells(self, first, second):
+        """Celdas (a, b, símbolo en first, símbolo en second) cuya relación cambia"""
+        old, new = self.codes[first], self.codes[second]
+        rows, cols = np.nonzero(old != new)
+        names = self.activities
+        return [(names[a], names[b], SYMBOLS[o], SYMBOLS[n])
+                for a, b, o, n in zip(rows.tolist(), cols.tolist(), old[rows, cols].tolist(), new[rows, cols].tolist())]
+
+    def conformance(self, first, second):
+        """Conformidad de huellas: fracción de celdas con la misma relación (1.0 = idénticas)"""
+        cells = self.codes.shape[1] ** 2
+        return 1.0 - np.count_nonzero(self.codes[first] != self.codes[second]) / cells if cells else 1.0
+
+    def diff(self, first, second):
+        """Diferencias entre dos ventanas: actividades, celdas de la huella y lugares"""
+        present_first, present_second = self.present[first], self.present[second]
+        names = np.array(self.activities, dtype=object)
+        return {
+            'from': self.names[first],
+            'to': self.names[second],
+            'conformance': self.conformance(first, second),
+            'added_activities': names[present_second & ~present_first].tolist(),
+            'removed_activities': names[present_first & ~present_second].tolist(),
+            'changed_cells': self.changed_cells(first, second),
+            'added_places': sorted(self.places[second] - self.places[first]),
+            'removed_places': sorted(self.places[first] - self.places[second]),
+        }
+
+    def consecutive(self):
+        """Diferencias entre cada ventana y la siguiente"""
+        return [self.diff(idx, idx + 1) for idx in range(len(self) - 1)]
+
+    def consecutive_conformance(self):
+        """Conformidad de cada ventana con la siguiente, en una sola operación"""
+        if len(self) < 2:
+            return np.zeros(0)
+        cells = self.codes.shape[1] ** 2 or 1
+        changed = np.count_nonzero((self.codes[1:] != self.codes[:-1]).reshape(len(self) - 1, -1), axis=1)
+        return 1.0 - changed / cells
+
+    def conformance_matrix(self):
+        """Conformidad de huellas entre todos los pares de ventanas (matriz ventanas x ventanas).
+
+        Solo intervienen las celdas que cambian en alguna ventana; cada una se
+        codifica en one-hot (una columna por símbolo) y las coincidencias de
+        todos los pares salen de un único producto de matrices.
+        """
+        windows = len(self)
+        flat = self.codes.reshape(windows, -1)
+        cells = flat.shape[1]
+        if not windows or not cells:
+            return np.ones((windows, windows))
+        varying = flat[:, (flat != flat[:1]).any(axis=0)]
+        if not varying.shape[1]:
+            return np.ones((windows, windows))
+
+        # float32 cuenta exactamente hasta 2**24 coincidencias; por encima se usa float64
+        dtype = np.float32 if varying.shape[1] < 2 ** 24 else np.float64
+        onehot = np.concatenate([(varying == code) for code in range(len(SYMBOLS))], axis=1).astype(dtype)
+        agreements = onehot @ onehot.T
+        differing = varying.shape[1] - agreements
+        return 1.0 - differing / cells
+
+    def drift_points(self, threshold=0.95):
+        """Índices i en los que la conformidad entre la ventana i y la i+1 cae por debajo de threshold"""
+        return np.flatnonzero(self.consecutive_conformance() < threshold).tolist()
@@ -0,0 +1,117 @@
+from collections.abc import Set
+
+import numpy as np
+
+# Códigos int8 de cada celda de la matriz de huella
+CHOICE = 0    # a # b
+CAUSAL = 1    # a -> b
+REVERSE = 2   # a <- b
+PARALLEL = 3  # a || b
+
+SYMBOLS = ('#', '->', '<-', '||')
+
+
+class RelationView(Set):
+    """Conjunto de solo lectura de los pares (a, b) con un código de la huella.
+
+    No materializa los pares: la pertenencia consulta una celda de la
+    matriz de códigos y la iteración recorre sus filas, así que ocupa lo
+    mismo para # (casi todos los pares) que para ->. Admite in, len,
+    iteración y las operaciones de conjuntos, que devuelven sets normales.
+    """
+
+    def __init__(self, footprint, code):
+        self.footprint = footprint
+        self.code = code
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def __contains__(self, pair):
+        if not isinstance(pair, tuple) or len(pair) != 2:
+            return False
+        try:
+            return bool(self.footprint.code(*pair) == self.code)
+        except (KeyError, TypeError):
+            return False
+
+    def __iter__(self):
+        names = self.footprint.activities
+        # Un solo recorrido vectorizado de la matriz, en orden de filas
+        rows, cols = np.nonzero(self.footprint.codes == self.code)
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            yield names[i], names[j]
+
+    def __len__(self):
+        return int(np.count_nonzero(self.footprint.codes == self.code))
+
+    def __repr__(self):
+        return f"RelationView({SYMBOLS[self.code]!r}, {len(self)} pares)"
+
+
+class Footprint:
+    """Matriz de huella compacta: códigos int8 indexados por actividad"""
+
+    def __init__(self, activities, codes):
+        self.activities = list(activities)
+        self.index = {act: i for i, act in enumerate(self.activities)}
+        self.codes = codes
+
+    @classmethod
+    def from_relations(cls, activities, causal_matrix, parallel_matrix):
+        """Construye la huella a partir de las máscaras booleanas de relaciones"""
+        codes = np.full(causal_matrix.shape, CHOICE, dtype=np.int8)
+        codes[causal_matrix] = CAUSAL
+        codes[causal_matrix.T] = REVERSE
+        codes[parallel_matrix] = PARALLEL
+        return cls(activities, codes)
+
+    @classmethod
+    def empty(cls):
+        return cls([], np.zeros((0, 0), dtype=np.int8))
+
+    def __len__(self):
+        return len(self.activities)
+
+    def mask(self, code):
+        """Máscara booleana |A|x|A| de las celdas con el código dado"""
+        return self.codes == code
+
+    def relation(self, code):
+        """Vista de conjunto (RelationView) de los pares con el código dado"""
+        return RelationView(self, code)
+
+    def code(self, a, b):
+        """Código int8 de la relación entre las actividades a y b"""
+        return self.codes[self.index[a], self.index[b]]
+
+    def __getitem__(self, pair):
+        """Símbolo de la relación entre a y b, p. ej. footprint['a', 'b'] -> '->'"""
+        a, b = pair
+        return SYMBOLS[self.code(a, b)]
+
+    def to_lists(self):
+        """Filas de símbolos alineadas con activities (apto para JSON)"""
+        return [[SYMBOLS[code] for code in row] for row in self.codes.tolist()]
+
+    def to_text(self):
+        """Tabla de texto plano de la huella, sin depender de pandas"""
+        width = max([2] + [len(act) for act in self.activities])
+        lines = [" " * width + "".join(f" {act:>{width}}" for act in self.activities)]
+        for act, row in zip(self.activities, self.to_lists()):
+            lines.append(f"{act:<{width}}" + "".join(f" {symbol:>{width}}" for symbol in row))
+        return "\n".join(lines)
+
+    def to_dataframe(self):
+        """Convierte la huella en un DataFrame de pandas para mostrarla"""
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas es opcional y no está instalado; use to_text() o instale pandas") from None
+
+        symbols = np.array(SYMBOLS, dtype=object)[self.codes]
+        return pd.DataFrame(symbols, index=self.activities, columns=self.activities)
+
+    def __repr__(self):
+        return f"Footprint({len(self)} actividades)"
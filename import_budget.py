@@ -0,0 +1,71 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# Módulos pesados que el camino de minería no debe cargar
+FORBIDDEN_MODULES = ('pandas', 'matplotlib', 'networkx')
+# Módulos de funciones opcionales que alpha importa solo dentro de los métodos que los usan
+LAZY_MODULES = ('importers', 'sharded', 'model_format', 'sampling', 'stream', 'conformance', 'petri_render')
+
+# Presupuesto por defecto para 'import alpha' en un intérprete nuevo (milisegundos):
+# NumPy se lleva unos 60-70 ms y el resto del camino de minería unos 15-20 ms
+DEFAULT_BUDGET_MS = 120.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+{exercise}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{'ms': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+# Ejecuta también el camino completo de minería para detectar importaciones perezosas
+_EXERCISE = "alpha.Alpha().parse_event_log('[<a,b,c>, <a,c,b>]').discover_relations().execute_alpha_algorithm()"
+
+
+def measure_import(module='alpha', repeat=3):
+    """Mide en procesos nuevos el tiempo de importación y los módulos cargados.
+
+    Devuelve el mejor tiempo de las repeticiones (ms) y las listas de módulos
+    prohibidos y de módulos opcionales que aparecieron en sys.modules tras
+    minar un log pequeño.
+    """
+    exercise = _EXERCISE if module == 'alpha' else ""
+    best, loaded, eager = None, [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, exercise=exercise)],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output)
+        best = result['ms'] if best is None else min(best, result['ms'])
+        loaded = [name for name in FORBIDDEN_MODULES if name in result['modules']]
+        eager = [name for name in LAZY_MODULES if name in result['modules'] and name != module]
+    return {'module': module, 'ms': best, 'forbidden_loaded': loaded, 'lazy_loaded': eager}
+
+
+def check_import_budget(module='alpha', budget_ms=DEFAULT_BUDGET_MS, repeat=3):
+    """Comprueba el presupuesto; devuelve (cumple, medición)"""
+    measurement = measure_import(module, repeat)
+    ok = measurement['ms'] <= budget_ms and not measurement['forbidden_loaded'] and not measurement['lazy_loaded']
+    return ok, measurement
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica el presupuesto de tiempo de importación del minero")
+    parser.add_argument('--module', default='alpha')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    ok, measurement = check_import_budget(args.module, args.budget_ms, args.repeat)
+    print(f"import {measurement['module']}: {measurement['ms']:.1f} ms (presupuesto {args.budget_ms:.0f} ms)")
+    if measurement['forbidden_loaded']:
+        print(f"Módulos pesados cargados: {', '.join(measurement['forbidden_loaded'])}")
+    if measurement['lazy_loaded']:
+        print(f"Módulos opcionales cargados al importar: {', '.join(measurement['lazy_loaded'])}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import csv
+import datetime
+import io
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+import zlib
+
+# Claves estándar de XES para el nombre de la actividad y su ciclo de vida
+XES_ACTIVITY_KEY = 'concept:name'
+XES_LIFECYCLE_KEY = 'lifecycle:transition'
+
+# Tamaño orientativo de cada partición temporal cuando el CSV no está agrupado por caso
+DEFAULT_PARTITION_BYTES = 64 * 1024 * 1024
+
+
+def _local_name(tag):
+    """Quita el espacio de nombres '{http://...}' de una etiqueta XML"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_xes_traces(source, activity_key=XES_ACTIVITY_KEY, lifecycle=None):
+    """Lee un log XES de forma incremental y genera cada traza como lista de actividades.
+
+    Usa iterparse y libera cada traza del árbol en cuanto se ha leído, de modo
+    que la memoria no crece con el tamaño del fichero. Si se indica lifecycle
+    (p. ej. 'complete'), solo se conservan los eventos con esa transición.
+    """
+    context = ET.iterparse(source, events=('start', 'end'))
+    root = None
+    trace = None
+
+    for event, elem in context:
+        tag = _local_name(elem.tag)
+        if event == 'start':
+            if root is None:
+                root = elem
+            elif tag == 'trace':
+                trace = []
+            continue
+
+        if tag == 'event' and trace is not None:
+            name, transition = None, None
+            for attribute in elem:
+                key = attribute.get('key')
+                if key == activity_key:
+                    name = attribute.get('value')
+                elif key == XES_LIFECYCLE_KEY:
+                    transition = attribute.get('value')
+            if name is not None and (lifecycle is None or transition is None
+                                     or transition.lower() == lifecycle.lower()):
+                trace.append(name)
+            elem.clear()
+        elif tag == 'trace' and trace is not None:
+            yield trace
+            trace = None
+            # Soltar las trazas ya procesadas para mantener la memoria acotada
+            root.clear()
+
+
+def _parse_timestamp(value):
+    """Marca de tiempo como datetime ISO-8601, número o, en último caso, texto"""
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _timestamp_key(value):
+    """Clave de orden homogénea para marcas de tiempo de tipos mezclados"""
+    if value is None or value == '':
+        return (0, 0.0, '')
+    moment = _parse_timestamp(value)
+    if isinstance(moment, datetime.datetime):
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        return (1, moment.timestamp(), '')
+    if isinstance(moment, float):
+        return (1, moment, '')
+    return (2, 0.0, moment)
+
+
+def _sorted_trace(events):
+    """Ordena los eventos (orden_fichero, marca, actividad) de un caso por tiempo"""
+    if len(events) == 1:
+        return [events[0][2]]
+    try:
+        # Camino rápido: marcas de un mismo tipo comparables directamente
+        keyed = [(_parse_timestamp(timestamp), position, activity) for position, timestamp, activity in events]
+        keyed.sort()
+    except TypeError:
+        # Tipos mezclados (con y sin zona horaria, vacías...): normalizar la clave
+        keyed = [(_timestamp_key(timestamp), position, activity) for position, timestamp, activity in events]
+        keyed.sort()
+    return [activity for _, _, activity in keyed]
+
+
+def _open_text(source, encoding):
+    """Devuelve (fichero de texto, acción al terminar: 'close', 'detach' o None)"""
+    if hasattr(source, 'read'):
+        if isinstance(source, io.TextIOBase):
+            return source, None
+        # No cerrar el fichero binario del llamante al soltar el envoltorio
+        return io.TextIOWrapper(source, encoding=encoding, newline=''), 'detach'
+    return open(source, encoding=encoding, newline=''), 'close'
+
+
+def _iter_rows(source, case_column, activity_column, timestamp_column, delimiter, encoding):
+    """Genera (caso, marca, actividad) leyendo el CSV fila a fila con E/S con búfer"""
+    handle, release = _open_text(source, encoding)
+    try:
+        reader = csv.reader(handle, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            case_idx = header.index(case_column)
+            activity_idx = header.index(activity_column)
+        except ValueError:
+            raise ValueError(f"El CSV debe tener las columnas '{case_column}' y '{activity_column}'; "
+                             f"encontradas: {header}") from None
+        time_idx = header.index(timestamp_column) if timestamp_column in header else None
+
+        for row in reader:
+            if not row:
+                continue
+            timestamp = row[time_idx] if time_idx is not None else None
+            yield row[case_idx], timestamp, row[activity_idx]
+    finally:
+        if release == 'close':
+            handle.close()
+        elif release == 'detach':
+            handle.detach()
+
+
+def iter_csv_traces(source, case_column='case_id', activity_column='activity', timestamp_column='timestamp',
+                    delimiter=',', encoding='utf-8', grouped=False, partition_bytes=DEFAULT_PARTITION_BYTES):
+    """Lee un CSV de eventos (caso, actividad, marca de tiempo) y genera las trazas.
+
+    Con grouped=True se asume que las filas de cada caso son contiguas y se
+    emite cada traza al cambiar de caso, en una sola pasada. Si no, las filas
+    se reparten por hash del caso en particiones temporales que luego se
+    agrupan de una en una, así la memoria queda acotada por el tamaño de una
+    partición y no por el del fichero. Dentro de cada caso los eventos se
+    ordenan por marca de tiempo (estable respecto al orden del fichero).
+    """
+    rows = _iter_rows(source, case_column, activity_column, timestamp_column, delimiter, encoding)
+    if grouped:
+        current, events = None, []
+        for position, (case, timestamp, activity) in enumerate(rows):
+            if case != current and events:
+                yield _sorted_trace(events)
+                events = []
+            current = case
+            events.append((position, timestamp, activity))
+        if events:
+            yield _sorted_trace(events)
+        return
+
+    size = os.path.getsize(source) if isinstance(source, (str, os.PathLike)) else 0
+    partitions = max(1, -(-size // partition_bytes))
+    if partitions == 1 and size:
+        # Cabe en una partición: agrupar directamente en memoria
+        yield from _group_partition(enumerate(rows))
+        return
+
+    if not size:
+        partitions = 16
+    with tempfile.TemporaryDirectory(prefix='alpha_csv_') as directory:
+        paths = [os.path.join(directory, f"part{idx}.csv") for idx in range(partitions)]
+        handles = [open(path, 'w', encoding='utf-8', newline='') for path in paths]
+        try:
+            writers = [csv.writer(handle) for handle in handles]
+            for position, (case, timestamp, activity) in enumerate(rows):
+                bucket = zlib.crc32(case.encode('utf-8')) % partitions
+                writers[bucket].writerow((position, case, timestamp if timestamp is not None else '', activity))
+        finally:
+            for handle in handles:
+                handle.close()
+
+        for path in paths:
+            with open(path, encoding='utf-8', newline='') as handle:
+                spilled = ((int(position), (case, timestamp, activity))
+                           for position, case, timestamp, activity in csv.reader(handle))
+                yield from _group_partition(spilled)
+
+
+def _group_partition(rows):
+    """Agrupa por caso las filas (posición, (caso, marca, actividad)) de una partición"""
+    cases = {}
+    for position, (case, timestamp, activity) in rows:
+        cases.setdefault(case, []).append((position, timestamp, activity))
+    for events in cases.values():
+        yield _sorted_trace(events)
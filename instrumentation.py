@@ -0,0 +1,110 @@
+from contextlib import contextmanager
+import functools
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def instrumented(stage):
+    """Decora un método de Alpha para medirlo solo si la instrumentación está activa"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.instrumentation is None:
+                return method(self, *args, **kwargs)
+            with self.instrumentation.stage(stage, self):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def miner_counts(miner):
+    """Cardinalidades del estado actual del minero"""
+    return {
+        'activities': len(miner.activity_set),
+        'variants': len(miner.variants),
+        'succession_pairs': int(np.count_nonzero(miner.succession_matrix)),
+        'pattern_pairs': len(miner.pattern_pairs),
+        'maximal_patterns': len(miner.maximal_patterns),
+        'places': len(miner.places),
+    }
+
+
+class Instrumentation:
+    """Registro por etapa de tiempo de reloj, tiempo de CPU y memoria del pipeline.
+
+    Cada etapa terminada produce un registro (diccionario) que se guarda en
+    records y se pasa a los hooks registrados. Con trace_memory se activa
+    tracemalloc para medir la memoria asignada neta y el pico de cada etapa,
+    lo que ralentiza notablemente la ejecución.
+    """
+
+    def __init__(self, trace_memory=False, hooks=()):
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks)
+        self.records = []
+        self._stack = []
+
+    def add_hook(self, callback):
+        """Registra callback(record), llamado al terminar cada etapa"""
+        self.hooks.append(callback)
+        return self
+
+    @contextmanager
+    def stage(self, name, miner=None):
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # Conservar el pico de la etapa padre antes de reiniciarlo
+            if self._stack:
+                self._stack[-1]['child_peak'] = max(self._stack[-1]['child_peak'], peak)
+            tracemalloc.reset_peak()
+            frame = {'memory': current, 'child_peak': current}
+        else:
+            frame = {}
+        self._stack.append(frame)
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                'depth': len(self._stack) - 1,
+                'wall_seconds': time.perf_counter() - wall,
+                'cpu_seconds': time.process_time() - cpu,
+            }
+            self._stack.pop()
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame['child_peak'])
+                record['allocated_bytes'] = current - frame['memory']
+                record['peak_bytes'] = peak - frame['memory']
+                if self._stack:
+                    self._stack[-1]['child_peak'] = max(self._stack[-1]['child_peak'], peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            if miner is not None:
+                record['counts'] = miner_counts(miner)
+
+            self.records.append(record)
+            for hook in self.hooks:
+                hook(record)
+
+    def report(self):
+        """Informe estructurado: registros en orden y totales por etapa"""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            total['calls'] += 1
+            total['wall_seconds'] += record['wall_seconds']
+            total['cpu_seconds'] += record['cpu_seconds']
+        return {'stages': list(self.records), 'totals': totals}
+
+    def clear(self):
+        self.records = []
+        return self
@@ -0,0 +1,106 @@
+from collections import Counter
+import random
+
+# Operadores de los árboles de proceso sintéticos
+SEQUENCE = 'seq'
+XOR = 'xor'
+AND = 'and'
+LOOP = 'loop'
+OPERATORS = (SEQUENCE, XOR, AND, LOOP)
+
+
+def build_process_tree(activities, rng, max_children=3, operators=OPERATORS):
+    """Construye un árbol de proceso aleatorio cuyas hojas son las actividades dadas.
+
+    Cada nodo interno es una tupla (operador, hijos); las hojas son nombres.
+    Un bucle tiene exactamente dos hijos: cuerpo y rehacer.
+    """
+    if len(activities) == 1:
+        return activities[0]
+
+    operator = rng.choice(operators)
+    if operator == LOOP:
+        parts = 2
+    else:
+        parts = rng.randint(2, min(max_children, len(activities)))
+
+    # Cortar la lista de actividades en partes no vacías
+    cuts = sorted(rng.sample(range(1, len(activities)), parts - 1))
+    bounds = [0] + cuts + [len(activities)]
+    children = [build_process_tree(activities[lo:hi], rng, max_children, operators)
+                for lo, hi in zip(bounds, bounds[1:])]
+    return (operator, children)
+
+
+def simulate_trace(tree, rng, loop_probability=0.3, max_loops=3):
+    """Genera una traza ejecutando el árbol de proceso una vez"""
+    if isinstance(tree, str):
+        return [tree]
+
+    operator, children = tree
+    if operator == SEQUENCE:
+        return [act for child in children for act in simulate_trace(child, rng, loop_probability, max_loops)]
+    if operator == XOR:
+        return simulate_trace(rng.choice(children), rng, loop_probability, max_loops)
+    if operator == AND:
+        # Intercalado aleatorio que respeta el orden interno de cada rama
+        branches = [simulate_trace(child, rng, loop_probability, max_loops) for child in children]
+        slots = [idx for idx, branch in enumerate(branches) for _ in branch]
+        rng.shuffle(slots)
+        positions = [0] * len(branches)
+        trace = []
+        for idx in slots:
+            trace.append(branches[idx][positions[idx]])
+            positions[idx] += 1
+        return trace
+
+    body, redo = children
+    trace = simulate_trace(body, rng, loop_probability, max_loops)
+    loops = 0
+    while loops < max_loops and rng.random() < loop_probability:
+        trace += simulate_trace(redo, rng, loop_probability, max_loops)
+        trace += simulate_trace(body, rng, loop_probability, max_loops)
+        loops += 1
+    return trace
+
+
+def generate_variants(n_activities=10, n_variants=20, max_trace_length=50, multiplicity=10,
+                      seed=0, max_attempts=None, operators=OPERATORS):
+    """Genera un multiconjunto de variantes a partir de un árbol de proceso aleatorio.
+
+    Se simulan trazas hasta reunir n_variants distintas de longitud como
+    máximo max_trace_length (o agotar los intentos); cada variante recibe
+    una frecuencia aleatoria entre 1 y multiplicity. Con la misma semilla
+    el resultado es siempre el mismo.
+    """
+    rng = random.Random(seed)
+    activities = [f"t{i}" for i in range(n_activities)]
+    tree = build_process_tree(activities, rng, operators=operators)
+
+    variants = Counter()
+    attempts = max_attempts if max_attempts is not None else 50 * n_variants
+    for _ in range(attempts):
+        if len(variants) >= n_variants:
+            break
+        trace = tuple(simulate_trace(tree, rng))
+        if len(trace) <= max_trace_length and trace not in variants:
+            variants[trace] = rng.randint(1, multiplicity)
+    return variants
+
+
+def format_log(variants):
+    """Serializa las variantes con el formato [<a,b,c>^n, ...]"""
+    return "[" + ", ".join(f"<{','.join(trace)}>^{count}" for trace, count in variants.items()) + "]"
+
+
+def generate_log(**params):
+    """Log sintético como texto; acepta los mismos parámetros que generate_variants"""
+    return format_log(generate_variants(**params))
+
+
+def write_log(path, **params):
+    """Escribe un log sintético en un fichero y devuelve sus variantes"""
+    variants = generate_variants(**params)
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(format_log(variants))
+    return variants
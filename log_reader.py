@@ -0,0 +1,626 @@
+from collections import Counter
+import os
+from sys import intern
+
+# Tamaño por defecto de cada bloque leído del fichero (1 MiB)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Resincronización de los límites de rango: trazas que deben analizarse sin error tras
+# un candidato y tamaño inicial y máximo de la ventana leída para comprobarlo
+RESYNC_TRACES = 4
+RESYNC_MIN_WINDOW = 1 << 10
+RESYNC_WINDOW = 1 << 20
+
+# Cuerpos de traza distintos recordados ya convertidos en tuplas (el resto se vuelve a analizar)
+BODY_CACHE_SIZE = 1 << 16
+
+_WHITESPACE_CHARS = ' \t\r\n\x0b\x0c'
+# Los nombres sin comillas ignoran los espacios: 'a b' es la actividad 'ab'
+_DROP_WHITESPACE = str.maketrans('', '', _WHITESPACE_CHARS)
+
+
+class LogFormatError(ValueError):
+    """Error de formato en un log, con la posición de la traza inválida.
+
+    offset es la posición absoluta (en bytes al leer ficheros, en caracteres
+    al analizar texto); line y column (desde 1) se indican cuando se conocen.
+    """
+
+    def __init__(self, message, offset, line=None, column=None):
+        location = f"línea {line}, columna {column}" if line is not None else f"byte {offset}"
+        super().__init__(f"{message} ({location})")
+        self.message = message
+        self.offset = offset
+        self.line = line
+        self.column = column
+
+    def __reduce__(self):
+        # Permite devolver el error desde procesos trabajadores (pickle)
+        return type(self), (self.message, self.offset, self.line, self.column)
+
+
+def split_activities(trace_body):
+    """Convierte el contenido de una traza 'a, b, c' en la lista de actividades"""
+    activities = trace_body.translate(_DROP_WHITESPACE).split(',')
+    return [act for act in activities if act]
+
+
+class _Symbols:
+    """Símbolos del formato como str o como bytes, según el tipo del buffer"""
+
+    def __init__(self, convert):
+        self.open_trace, self.close_trace, self.quote, self.caret = map(convert, '<>"^')
+        self.open_log, self.close_log, self.newline, self.backslash = map(convert, '[]\n\\')
+        self.whitespace = convert(_WHITESPACE_CHARS)
+        self.separators = convert(_WHITESPACE_CHARS + ',')
+        # Lo que puede seguir a '>' cuando hay (o podría haber) un multiplicador
+        self.after_trace = convert(_WHITESPACE_CHARS + '^')
+        self.digits = convert('0123456789')
+
+
+_TEXT = _Symbols(str)
+_BINARY = _Symbols(lambda text: text.encode('ascii'))
+
+
+class _Incomplete(Exception):
+    """La traza en curso continúa en el siguiente bloque"""
+
+
+class LogTokenizer:
+    """Analizador de una sola pasada del formato [<a,b>^n, ...] que valida mientras lee.
+
+    Recorre el texto (str) o los bytes saltando de delimitador en delimitador
+    con búsquedas nativas, sin expresiones regulares: cada cuerpo de traza
+    distinto se convierte una sola vez en una tupla de actividades y los
+    nombres se internan (sys.intern), así que las trazas repetidas comparten
+    objetos. count() agrega además un log completo en variantes sin pasar por
+    trazas individuales. Los nombres pueden ir entre comillas dobles ("revisar
+    pedido", con \\" y \\\\ como escapes) para incluir espacios, comas o '<>'.
+
+    Los corchetes exteriores son opcionales pero deben estar equilibrados, y
+    entre trazas solo se admiten espacios y comas. Los errores lanzan
+    LogFormatError con la posición, la línea y la columna. Con
+    start_of_log=False (lectura desde mitad de un fichero) no se conocen la
+    línea ni el corchete de apertura, y se admite un ']' final.
+    """
+
+    def __init__(self, start_of_log=True):
+        self._bodies = {}
+        self.traces = 0
+        # None: se desconoce si el log abrió con '[' (lectura desde mitad del fichero)
+        self._bracket = False if start_of_log else None
+        self._closed = False
+        self._line = 1 if start_of_log else None
+        self._line_start = 0
+
+    def scan(self, buffer, final=True, base=0):
+        """Analiza las trazas completas de buffer, que empieza en la posición absoluta base.
+
+        Devuelve ([(actividades, multiplicador, posición)], consumido): con
+        final=False, lo que queda desde consumido (una traza cortada al final
+        del bloque) debe volver a pasarse junto con el bloque siguiente.
+        """
+        symbols = _BINARY if isinstance(buffer, bytes) else _TEXT
+        find = buffer.find
+        open_trace, close_trace, quote = symbols.open_trace, symbols.close_trace, symbols.quote
+        separators, after_trace = symbols.separators, symbols.after_trace
+        bodies = self._bodies
+        # Sin comillas en todo el buffer, cada traza termina en el primer '>'
+        quoted = find(quote) != -1
+        traces = []
+        append = traces.append
+        size = len(buffer)
+        pos = 0
+
+        while True:
+            start = find(open_trace, pos)
+            stop = size if start == -1 else start
+            if self._closed or (stop > pos and buffer[pos:stop].strip(separators)):
+                self._check_gap(buffer, pos, stop, symbols, base, self.traces + len(traces))
+            if start == -1:
+                self.traces += len(traces)
+                # El resto ya está validado (y anotado el ']' si lo había): se consume entero
+                if final:
+                    self._finish(buffer, symbols, base)
+                return traces, size
+
+            try:
+                end = find(close_trace, start + 1)
+                if end != -1 and not (quoted and find(quote, start + 1, end) != -1):
+                    body = buffer[start + 1:end]
+                    activities = bodies.get(body)
+                    if activities is None:
+                        if len(bodies) >= BODY_CACHE_SIZE:
+                            bodies.clear()
+                        activities = bodies[body] = self._plain_body(body, start + 1, buffer, symbols, base)
+                elif end == -1 and not (quoted and find(quote, start + 1) != -1):
+                    self._unclosed(buffer, start, start + 1, final, symbols, base)
+                else:
+                    end, activities = self._quoted_body(buffer, start, final, symbols, base)
+
+                # Caso habitual: tras '>' viene directamente un separador, sin multiplicador
+                following = buffer[end + 1:end + 2]
+                if following and following not in after_trace:
+                    pos, multiplier = end + 1, 1
+                else:
+                    pos, multiplier = self._multiplier(buffer, end + 1, final, symbols, base)
+            except _Incomplete:
+                self.traces += len(traces)
+                return traces, start
+
+            append((activities, multiplier, base + start))
+
+    def count(self, text):
+        """Multiconjunto de variantes (traza -> frecuencia) de un log completo, ya validado.
+
+        Para texto sin comillas, el log se corta por '<' y las trazas con el
+        mismo texto se cuentan de una vez (ver _count_block). Ante cualquier
+        irregularidad se repite el análisis con scan(), que da el mismo
+        resultado y los mismos errores con su línea y columna.
+        """
+        variants = {}
+        if isinstance(text, bytes) or not self._count_block(text, variants, final=True):
+            self._count_traces(self.scan(text)[0], variants)
+        return Counter(variants)
+
+    def _count_block(self, text, variants, final):
+        """Suma a variants las trazas de text (sin comillas) cortándolo por '<'.
+
+        text empieza en el inicio del log o en un '<' y, con final=False,
+        termina justo antes de un '<'. Devuelve False sin modificar nada si
+        el bloque tiene comillas o cualquier irregularidad: entonces hay que
+        analizarlo con scan(). Los textos de traza repetidos se agrupan antes
+        (Counter en C) y cada uno se valida y convierte una sola vez.
+        """
+        if self._closed or '"' in text:
+            return False
+        header, *pieces = text.split('<')
+        if not pieces:
+            return False
+        opening = header.strip(_TEXT.separators)
+        bracket = self._bracket
+        if opening == '[' and bracket is False and not self.traces:
+            bracket = True
+        elif opening:
+            return False
+
+        found = {}
+        get = found.get
+        gaps = {}
+        last = pieces.pop() if final else None
+        for piece, count in Counter(pieces).items():
+            body, closing, rest = piece.partition('>')
+            multiplier = gaps.get(rest)
+            if multiplier is None:
+                multiplier = gaps[rest] = _gap_multiplier(rest)
+            if multiplier is None or not closing:
+                return False
+            if multiplier:
+                names = body.split(',')
+                if ' ' in body or '' in names or not body.isprintable():
+                    activities = self._plain_body(body, 0, text, _TEXT, 0)
+                else:
+                    activities = tuple(map(intern, names))
+                found[activities] = get(activities, 0) + multiplier * count
+
+        if final:
+            # La última traza puede ir seguida del ']' de cierre
+            body, closing, rest = last.partition('>')
+            multiplier = _gap_multiplier(rest, closing_bracket=bracket)
+            if multiplier is None or not closing:
+                return False
+            if multiplier:
+                activities = self._plain_body(body, 0, text, _TEXT, 0)
+                found[activities] = get(activities, 0) + multiplier
+            pieces.append(last)
+            self._closed = bool(bracket)
+
+        self._bracket = bracket
+        self.traces += len(pieces)
+        if variants:
+            get = variants.get
+            for activities, count in found.items():
+                variants[activities] = get(activities, 0) + count
+        else:
+            variants.update(found)
+        return True
+
+    @staticmethod
+    def _count_traces(traces, variants):
+        get = variants.get
+        for activities, multiplier, _ in traces:
+            if multiplier > 0:
+                variants[activities] = get(activities, 0) + multiplier
+
+    def advance(self, buffer, consumed, base=0):
+        """Anota las líneas de buffer[:consumed] antes de descartarlas (posiciones de los errores)"""
+        if self._line is not None:
+            newline = _BINARY.newline if isinstance(buffer, bytes) else _TEXT.newline
+            lines = buffer.count(newline, 0, consumed)
+            if lines:
+                self._line += lines
+                self._line_start = base + buffer.rfind(newline, 0, consumed) + 1
+        return self
+
+    def _error(self, message, buffer, position, symbols, base):
+        """LogFormatError en la posición relativa position de buffer"""
+        if self._line is None:
+            return LogFormatError(message, base + position)
+        line = self._line + buffer.count(symbols.newline, 0, position)
+        previous = buffer.rfind(symbols.newline, 0, position)
+        column = position - previous if previous != -1 else base + position - self._line_start + 1
+        return LogFormatError(message, base + position, line, column)
+
+    def _check_gap(self, buffer, start, stop, symbols, base, seen):
+        """Valida carácter a carácter el texto entre dos trazas (camino lento, solo si no son separadores)"""
+        for position in range(start, stop):
+            char = buffer[position:position + 1]
+            if self._closed:
+                if char not in symbols.whitespace:
+                    raise self._error("Contenido después del ']' de cierre del log", buffer, position, symbols, base)
+            elif char in symbols.separators:
+                continue
+            elif char == symbols.open_log and self._bracket is False and not seen:
+                self._bracket = True
+            elif char == symbols.close_log and self._bracket is not False:
+                self._closed = True
+            elif char == symbols.close_log:
+                raise self._error("']' sin '[' de apertura", buffer, position, symbols, base)
+            elif char == symbols.caret:
+                raise self._error("Multiplicador inválido, debe ser ^n con n entero", buffer, position, symbols, base)
+            else:
+                raise self._error("Se esperaba el inicio de una traza '<'", buffer, position, symbols, base)
+        if self._closed and stop < len(buffer):
+            raise self._error("Contenido después del ']' de cierre del log", buffer, stop, symbols, base)
+
+    def _finish(self, buffer, symbols, base):
+        if self._bracket and not self._closed:
+            raise self._error("Falta el ']' de cierre del log", buffer, len(buffer), symbols, base)
+
+    def _unclosed(self, buffer, start, position, final, symbols, base):
+        """Traza sin '>' (desde position, tras las comillas ya saltadas): esperar al siguiente bloque o fallar"""
+        nested = buffer.find(symbols.open_trace, position)
+        if nested != -1:
+            raise self._error("'<' dentro de una traza (¿falta el '>' de la anterior?)", buffer, nested, symbols, base)
+        if not final:
+            raise _Incomplete
+        raise self._error("Traza sin cerrar, falta '>'", buffer, start, symbols, base)
+
+    def _decode(self, body, position, buffer, symbols, base):
+        if symbols is _TEXT:
+            return body
+        try:
+            return body.decode('utf-8')
+        except UnicodeDecodeError:
+            raise self._error("La traza no es UTF-8 válido", buffer, position, symbols, base) from None
+
+    def _plain_body(self, body, position, buffer, symbols, base):
+        """Actividades de un cuerpo sin comillas: separar por comas, quitar espacios e internar"""
+        nested = body.find(symbols.open_trace)
+        if nested != -1:
+            raise self._error("'<' dentro de una traza (¿falta el '>' de la anterior?)", buffer, position + nested,
+                              symbols, base)
+        text = self._decode(body, position, buffer, symbols, base)
+        if ' ' in text or not text.isprintable():
+            text = text.translate(_DROP_WHITESPACE)
+        names = text.split(',')
+        if '' in names:
+            names = [name for name in names if name]
+        return tuple(map(intern, names))
+
+    def _quoted_body(self, buffer, start, final, symbols, base):
+        """Cuerpo con nombres entre comillas: el '>' de cierre es el primero fuera de comillas"""
+        position = start + 1
+        while True:
+            end = buffer.find(symbols.close_trace, position)
+            opening = buffer.find(symbols.quote, position)
+            if opening != -1 and (end == -1 or opening < end):
+                position = self._skip_quoted(buffer, opening, final, symbols, base)
+                continue
+            if end == -1:
+                self._unclosed(buffer, start, position, final, symbols, base)
+            break
+
+        text = self._decode(buffer[start + 1:end], start + 1, buffer, symbols, base)
+        try:
+            return end, tuple(self._split_quoted(text))
+        except LogFormatError as error:
+            # La posición dentro del cuerpo es en caracteres; en bytes hay que recodificar el prefijo
+            index = error.offset
+            if symbols is _BINARY:
+                index = len(text[:index].encode('utf-8'))
+            raise self._error(error.message, buffer, start + 1 + index, symbols, base) from None
+
+    def _skip_quoted(self, buffer, opening, final, symbols, base):
+        """Posición tras la comilla que cierra la que empieza en opening"""
+        position = opening + 1
+        while True:
+            closing = buffer.find(symbols.quote, position)
+            if closing == -1:
+                if not final:
+                    raise _Incomplete
+                raise self._error("Comillas sin cerrar", buffer, opening, symbols, base)
+            escapes = 0
+            while buffer[closing - escapes - 1:closing - escapes] == symbols.backslash:
+                escapes += 1
+            if escapes % 2 == 0:
+                return closing + 1
+            position = closing + 1
+
+    def _split_quoted(self, text):
+        """Nombres de un cuerpo con comillas; los errores llevan la posición dentro de text"""
+        names = []
+        position, size = 0, len(text)
+        while position < size:
+            while position < size and text[position] in _WHITESPACE_CHARS:
+                position += 1
+            if position < size and text[position] == '"':
+                opening = position
+                chars = []
+                position += 1
+                while text[position] != '"':
+                    if text[position] == '\\':
+                        position += 1
+                    chars.append(text[position])
+                    position += 1
+                position += 1
+                if not chars:
+                    raise LogFormatError("Nombre de actividad vacío entre comillas", opening)
+                name = ''.join(chars)
+                names.append(intern(name))
+                while position < size and text[position] in _WHITESPACE_CHARS:
+                    position += 1
+                if position < size and text[position] != ',':
+                    raise LogFormatError("Se esperaba ',' tras el nombre entre comillas", position)
+            else:
+                end = text.find(',', position)
+                end = size if end == -1 else end
+                bare = text[position:end]
+                for symbol, message in (('<', "'<' dentro de una traza (¿falta el '>' de la anterior?)"),
+                                        ('"', "Comilla dentro de un nombre sin comillas")):
+                    if symbol in bare:
+                        raise LogFormatError(message, position + bare.index(symbol))
+                name = bare.translate(_DROP_WHITESPACE)
+                if name:
+                    names.append(intern(name))
+                position = end
+            position += 1
+        return names
+
+    def _multiplier(self, buffer, position, final, symbols, base):
+        """Multiplicador opcional ^n tras el '>' de la traza: (posición siguiente, n)"""
+        size = len(buffer)
+        after = position
+        while after < size and buffer[after:after + 1] in symbols.whitespace:
+            after += 1
+        if after == size and not final:
+            raise _Incomplete
+        if buffer[after:after + 1] != symbols.caret:
+            return position, 1
+
+        digits = after + 1
+        while digits < size and buffer[digits:digits + 1] in symbols.whitespace:
+            digits += 1
+        end = digits
+        while end < size and buffer[end:end + 1] in symbols.digits:
+            end += 1
+        if end == size and not final:
+            raise _Incomplete
+        if end == digits:
+            raise self._error("Multiplicador inválido, debe ser ^n con n entero", buffer, after, symbols, base)
+        return end, int(buffer[digits:end])
+
+
+def _gap_multiplier(rest, closing_bracket=None):
+    """Multiplicador del texto que sigue a '>' hasta el siguiente '<', o None si no es válido.
+
+    Con closing_bracket (última traza) el texto debe terminar con ']' si el
+    log empezó con '[' y sin él en caso contrario.
+    """
+    remainder = rest.lstrip(_WHITESPACE_CHARS)
+    multiplier = 1
+    if remainder[:1] == '^':
+        remainder = remainder[1:].lstrip(_WHITESPACE_CHARS)
+        digits = len(remainder) - len(remainder.lstrip(_TEXT.digits))
+        if not digits:
+            return None
+        multiplier = int(remainder[:digits])
+        remainder = remainder[digits:]
+    remainder = remainder.lstrip(_TEXT.separators)
+    if closing_bracket:
+        if remainder[:1] != ']' or remainder[1:].strip(_WHITESPACE_CHARS):
+            return None
+    elif remainder:
+        return None
+    return multiplier
+
+
+def count_log_text(text):
+    """Variantes (traza -> frecuencia) de un log completo en texto, validado en una sola pasada"""
+    return LogTokenizer().count(text)
+
+
+def parse_log_text(text):
+    """Trazas (actividades, multiplicador, posición) de un log completo en texto o bytes"""
+    return LogTokenizer().scan(text)[0]
+
+
+def _open_source(source):
+    """Devuelve (fichero, debe_cerrarse) a partir de una ruta o un objeto fichero"""
+    if hasattr(source, 'read'):
+        return source, False
+    return open(source, 'rb'), True
+
+
+def _read_chunk(stream, chunk_size):
+    chunk = stream.read(chunk_size)
+    if isinstance(chunk, str):
+        chunk = chunk.encode('utf-8')
+    return chunk
+
+
+def iter_event_log(source, chunk_size=DEFAULT_CHUNK_SIZE, offset=0):
+    """Lee un log con formato [<a,b>^n, ...] de forma incremental.
+
+    Acepta una ruta o un objeto fichero (binario o de texto) y genera tuplas
+    (actividades, multiplicador, offset) sin cargar el fichero completo en
+    memoria: solo se conserva el fragmento pendiente de la traza en curso.
+    Lanza LogFormatError con la posición de cualquier traza inválida.
+    offset es la posición absoluta del inicio del flujo, para informar de
+    posiciones correctas al leer desde mitad de un fichero.
+    """
+    stream, must_close = _open_source(source)
+    tokenizer = LogTokenizer(start_of_log=offset == 0)
+    try:
+        buffer = b''
+        base = offset  # Offset absoluto del inicio de buffer
+        while True:
+            chunk = _read_chunk(stream, chunk_size)
+            buffer += chunk
+            traces, consumed = tokenizer.scan(buffer, final=not chunk, base=base)
+            yield from traces
+            if not chunk:
+                break
+
+            # Descartar lo ya procesado y conservar solo el fragmento pendiente
+            tokenizer.advance(buffer, consumed, base)
+            base += consumed
+            buffer = buffer[consumed:]
+    finally:
+        if must_close:
+            stream.close()
+
+
+def count_event_log(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Variantes (traza -> frecuencia) de un log leído por bloques, con los errores de iter_event_log.
+
+    Cada bloque se corta en su último '<' (todas las trazas anteriores están
+    completas) y se cuenta de una vez como en LogTokenizer.count(); los
+    bloques con comillas o cualquier irregularidad pasan por scan().
+    """
+    stream, must_close = _open_source(source)
+    tokenizer = LogTokenizer()
+    variants = {}
+    try:
+        buffer = b''
+        base = 0  # Offset absoluto del inicio de buffer
+        while True:
+            chunk = _read_chunk(stream, chunk_size)
+            buffer += chunk
+            final = not chunk
+            consumed = len(buffer) if final else max(buffer.rfind(b'<'), 0)
+            if consumed or final:
+                try:
+                    text = buffer[:consumed].decode('utf-8')
+                except UnicodeDecodeError:
+                    text = None
+                if text is None or not tokenizer._count_block(text, variants, final):
+                    traces, consumed = tokenizer.scan(buffer, final=final, base=base)
+                    tokenizer._count_traces(traces, variants)
+            if final:
+                break
+
+            # Descartar lo ya contado y conservar solo la traza que empieza en el último '<'
+            tokenizer.advance(buffer, consumed, base)
+            base += consumed
+            buffer = buffer[consumed:]
+    finally:
+        if must_close:
+            stream.close()
+    return Counter(variants)
+
+
+def shard_ranges(path, shards, stats=None):
+    """Divide un fichero en hasta shards rangos de bytes [inicio, fin) consecutivos.
+
+    Cada límite interior se lleva al comienzo de una traza cercana con una
+    resincronización local (ver _resync), sin recorrer el fichero desde el
+    principio; los límites que no se pueden resincronizar se descartan y su
+    rango se une al anterior. Si se pasa un diccionario stats, se anotan en
+    stats['bytes_scanned'] los bytes leídos para resincronizar.
+    """
+    size = os.path.getsize(path)
+    shards = max(1, min(shards, size or 1))
+    bounds = [0]
+    scanned = 0
+    with open(path, 'rb') as handle:
+        for idx in range(1, shards):
+            aligned, read = _resync(handle, size * idx // shards, size)
+            scanned += read
+            if aligned is not None and bounds[-1] < aligned < size:
+                bounds.append(aligned)
+    bounds.append(size)
+    if stats is not None:
+        stats['bytes_scanned'] = scanned
+    return list(zip(bounds, bounds[1:]))
+
+
+def _resync(handle, position, size):
+    """Primer '<' en o tras position desde el que el log se analiza sin errores: (posición, bytes leídos).
+
+    Un '<' puede estar dentro de un nombre entre comillas, y desde mitad del
+    fichero no se sabe si se está dentro o fuera de unas comillas. Cada
+    candidato se valida analizando hacia delante una ventana acotada
+    (RESYNC_TRACES trazas, ampliando la ventana hasta RESYNC_WINDOW bytes):
+    desde un '<' entre comillas las comillas quedan desemparejadas y el
+    análisis falla enseguida. Devuelve (None, leídos) si ninguna ventana
+    decide, y (size, leídos) si no quedan trazas.
+    """
+    window = RESYNC_MIN_WINDOW
+    read = 0
+    while True:
+        handle.seek(position)
+        buffer = handle.read(window)
+        read += len(buffer)
+        final = position + len(buffer) >= size
+        candidate = buffer.find(b'<')
+        while candidate != -1:
+            try:
+                traces, _ = LogTokenizer(start_of_log=False).scan(buffer[candidate:], final=final)
+            except LogFormatError:
+                candidate = buffer.find(b'<', candidate + 1)
+                continue
+            if final or len(traces) >= RESYNC_TRACES:
+                return position + candidate, read
+            # Ventana demasiado corta para decidir
+            break
+        if candidate == -1 and final:
+            return size, read
+        if window >= RESYNC_WINDOW:
+            return None, read
+        window *= 4
+
+
+def iter_event_log_range(path, start, end, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lee solo las trazas cuyo '<' inicial cae en el rango de bytes [start, end).
+
+    start debe ser el inicio de una traza o un límite de shard_ranges (un
+    '<' entre comillas no es el comienzo de una traza); se avanza hasta el
+    primer '<' a partir de start. El rango anterior sigue leyendo hasta la
+    primera traza que empieza en o después de su fin, así que el texto entre
+    rangos también queda validado. Al terminar, el generador devuelve (valor
+    de StopIteration) la posición de esa traza, o el tamaño del fichero.
+    """
+    with open(path, 'rb') as stream:
+        stream.seek(start)
+        position = start
+        if start > 0:
+            # Avanzar hasta el comienzo de la primera traza del rango
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    return position
+                found = chunk.find(b'<')
+                if found != -1:
+                    position += found
+                    stream.seek(position)
+                    break
+                position += len(chunk)
+        if position >= end:
+            return position
+
+        for activities, multiplier, offset in iter_event_log(stream, chunk_size, offset=position):
+            if offset >= end:
+                return offset
+            yield activities, multiplier, offset
+        return os.fstat(stream.fileno()).st_size
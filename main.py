@@ -1,44 +1,55 @@
 from alpha import Alpha
-import re
+from log_reader import count_log_text
+from model_cache import ModelCache
+import importlib.util
 import os
 
 # Variable global para almacenar la última instancia procesada
 ultima_instancia_alpha = None
 ultimo_nombre_log = ""
 
+# Caché de modelos compartida para no volver a minar logs equivalentes
+cache_modelos = ModelCache()
+
 def validar_formato_log(cadena_log):
     """Valida y limpia el formato del log de eventos"""
+    return analizar_log(cadena_log)[0]
+
+def analizar_log(cadena_log):
+    """Como validar_formato_log, pero devuelve también las variantes ya analizadas: (log, variantes)"""
     # Limpiar espacios al inicio y final
     cadena_log = cadena_log.strip()
     
-    # Verificar si tiene corchetes exteriores
-    if not (cadena_log.startswith('[') and cadena_log.endswith(']')):
-        # Agregar corchetes si no los tiene
-        cadena_log = f"[{cadena_log}]"
-    
-    # Verificar que tiene al menos una traza válida
-    trace_pattern = re.compile(r'<[^>]*>')
-    if not trace_pattern.search(cadena_log):
+    # Una sola pasada del analizador valida el formato; los errores indican línea y columna
+    variantes = count_log_text(cadena_log)
+    if not variantes:
         raise ValueError("El log no contiene trazas válidas. Debe tener al menos una traza en formato <a,b,c>")
     
-    # Verificar el formato general usando expresiones regulares
-    full_pattern = re.compile(r'^\[(<[a-zA-Z0-9,]+>(\^[0-9]+)?)(,\s*<[a-zA-Z0-9,]+>(\^[0-9]+)?)*\]$')
-    if not full_pattern.match(cadena_log):
-        raise ValueError("Formato incorrecto. Debe seguir el patrón [<a,b,c>, <d,e>^2, ...]")
+    # Agregar corchetes si no los tiene
+    if not cadena_log.startswith('['):
+        cadena_log = f"[{cadena_log}]"
     
-    return cadena_log
+    return cadena_log, variantes
 
-def procesar_y_mostrar_resultados(log, nombre_log="", visualizar=True, guardar_grafico=False):
-    """Procesa un log y muestra todos los resultados del algoritmo Alpha"""
+def procesar_y_mostrar_resultados(log, nombre_log="", visualizar=True, guardar_grafico=False, variantes=None):
+    """Procesa un log y muestra todos los resultados del algoritmo Alpha.
+
+    Si se pasan las variantes ya analizadas (ver analizar_log) el log
+    no se vuelve a analizar.
+    """
     global ultima_instancia_alpha, ultimo_nombre_log
     
     print(f"\n=== ANÁLISIS DEL LOG {nombre_log} ===\n")
     print(f"Log: {log}")
     
     # Crear instancia y procesar
-    alpha = Alpha()
+    alpha = Alpha(cache=cache_modelos)
     try:
-        alpha.parse_event_log(log).discover_relations().execute_alpha_algorithm()
+        if variantes is None:
+            alpha.parse_event_log(log)
+        else:
+            alpha.variants = variantes
+        alpha.discover_relations().execute_alpha_algorithm()
         
         # Guardar la instancia en memoria para uso posterior
         ultima_instancia_alpha = alpha
@@ -51,7 +62,7 @@ def procesar_y_mostrar_resultados(log, nombre_log="", visualizar=True, guardar_g
         
         # Mostrar matriz de huella
         print("\nMatriz de huella:")
-        print(alpha.create_footprint_matrix())
+        print(alpha.footprint.to_text())
         
         # Mostrar lugares
         print("\nLugares identificados:")
@@ -99,9 +110,9 @@ def procesar_y_mostrar_resultados(log, nombre_log="", visualizar=True, guardar_g
             flow_labels.append((src, dst))
         print(f"FL = {flow_labels}")
         
-        # Visualizar la red de Petri
-        if visualizar:
-            mostrar_grafico(alpha, nombre_log, guardar_grafico)
+        # Visualizar y/o guardar la red de Petri
+        if visualizar or guardar_grafico:
+            mostrar_grafico(alpha, nombre_log, guardar_grafico, mostrar=visualizar)
         
         print("\nEjecutado correctamente")
         return True
@@ -111,8 +122,27 @@ def procesar_y_mostrar_resultados(log, nombre_log="", visualizar=True, guardar_g
         traceback.print_exc()
         return False
 
-def mostrar_grafico(alpha, nombre_log="", guardar=False):
-    """Muestra y/o guarda el gráfico de la red de Petri"""
+def hay_visualizacion():
+    """Comprueba si matplotlib y networkx están instalados sin llegar a importarlos"""
+    return all(importlib.util.find_spec(modulo) is not None for modulo in ('matplotlib', 'networkx'))
+
+def mostrar_grafico(alpha, nombre_log="", guardar=False, mostrar=True):
+    """Muestra y/o guarda el gráfico de la red de Petri (como SVG si no hay matplotlib)"""
+    # Crear directorio para gráficos si no existe
+    if guardar and not os.path.exists("graficos"):
+        os.makedirs("graficos")
+    # Nombre del archivo basado en el nombre del log
+    nombre_archivo = f"graficos/red_petri_{nombre_log.replace(' ', '_')}"
+    
+    if not hay_visualizacion():
+        if not guardar:
+            print("\nLa visualización no está disponible. Instale matplotlib y networkx para ver gráficos.")
+            return False
+        # Sin librerías gráficas se puede guardar igualmente la red como SVG
+        alpha.render(f"{nombre_archivo}.svg")
+        print(f"\nGráfico guardado como: {nombre_archivo}.svg")
+        return True
+    
     try:
         import matplotlib.pyplot as plt
         
@@ -120,14 +150,12 @@ def mostrar_grafico(alpha, nombre_log="", guardar=False):
         fig = alpha.visualize_petri_net()
         if fig:
             if guardar:
-                # Crear directorio para gráficos si no existe
-                if not os.path.exists("graficos"):
-                    os.makedirs("graficos")
-                
-                # Nombre del archivo basado en el nombre del log
-                nombre_archivo = f"graficos/red_petri_{nombre_log.replace(' ', '_')}.png"
-                fig.savefig(nombre_archivo)
-                print(f"\nGráfico guardado como: {nombre_archivo}")
+                fig.savefig(f"{nombre_archivo}.png")
+                print(f"\nGráfico guardado como: {nombre_archivo}.png")
+            
+            if not mostrar:
+                plt.close(fig)
+                return True
             
             # Mostrar el gráfico en una ventana
             plt.show()
@@ -136,9 +164,6 @@ def mostrar_grafico(alpha, nombre_log="", guardar=False):
         else:
             print("\nNo se pudo generar la visualización.")
             return False
-    except ImportError:
-        print("\nLa visualización no está disponible. Instale matplotlib y networkx para ver gráficos.")
-        return False
     except Exception as e:
         print(f"\nError al visualizar: {e}")
         return False
@@ -153,13 +178,9 @@ def main():
     print("Ejemplo: [<a,b,c,d>^2, <a,c,b,d>^1, <a,e,d>^1]")
     print("Agregue ^n para indicar que una traza se repite n veces.")
     
-    # Verificar si la visualización está disponible
-    visualizacion_disponible = True
-    try:
-        import matplotlib.pyplot as plt
-        import networkx as nx
-    except ImportError:
-        visualizacion_disponible = False
+    # Verificar si la visualización está disponible sin llegar a importar las librerías
+    visualizacion_disponible = hay_visualizacion()
+    if not visualizacion_disponible:
         print("\nNOTA: Las bibliotecas necesarias para visualización no están instaladas.")
         print("Instale matplotlib y networkx con: pip install matplotlib networkx")
     
@@ -191,9 +212,9 @@ def main():
         elif opcion == '1':
             entrada_log = input("\nIngrese el log: ")
             try:
-                entrada_log = validar_formato_log(entrada_log)
+                entrada_log, variantes = analizar_log(entrada_log)
                 procesar_y_mostrar_resultados(entrada_log, "PERSONALIZADO", 
-                                             visualizacion_disponible, False)
+                                             visualizacion_disponible, False, variantes)
             except ValueError as e:
                 print(f"\nError de formato: {e}")
                 print("Revise que su log tenga el formato correcto y vuelva a intentarlo.")
@@ -208,8 +229,7 @@ def main():
             procesar_y_mostrar_resultados(log3, "EJEMPLO_3", visualizacion_disponible, False)
         elif opcion == '5':
             if not visualizacion_disponible:
-                print("\nLa visualización no está disponible. Instale matplotlib y networkx primero.")
-                continue
+                print("\nSin matplotlib y networkx el gráfico se guardará como SVG.")
                 
             # Primero pedir el nombre del archivo
             nombre_archivo = input("\nIngrese el nombre para guardar el gráfico: ").strip()
@@ -220,9 +240,9 @@ def main():
             entrada_log = input("\nIngrese el log para generar el gráfico: ")
             
             try:
-                entrada_log = validar_formato_log(entrada_log)
+                entrada_log, variantes = analizar_log(entrada_log)
                 # Procesar y guardar directamente, sin mostrar el gráfico en pantalla
-                procesar_y_mostrar_resultados(entrada_log, nombre_archivo, False, True)
+                procesar_y_mostrar_resultados(entrada_log, nombre_archivo, False, True, variantes)
             except ValueError as e:
                 print(f"\nError de formato: {e}")
                 print("Revise que su log tenga el formato correcto y vuelva a intentarlo.")
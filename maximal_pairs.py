@@ -0,0 +1,88 @@
+import numpy as np
+
+
+def mask_from_row(row):
+    """Convierte una fila booleana de NumPy en una máscara de bits entera"""
+    return int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little')
+
+
+def iter_bits(mask):
+    """Itera los índices de los bits activos de una máscara"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def ids_from_mask(mask):
+    return tuple(iter_bits(mask))
+
+
+def maximal_cliques(candidates, neighbours, excluded=0, clique=0, required=0):
+    """Bron–Kerbosch con pivote sobre máscaras: cliques maximales que amplían clique.
+
+    Si se indica required, solo se exploran ramas cuyo clique final pueda
+    contener algún vértice de esa máscara.
+    """
+    stack = [(clique, candidates, excluded)]
+    while stack:
+        clique, pending, excluded = stack.pop()
+        if required and not (clique | pending) & required:
+            continue
+        if not pending:
+            if not excluded:
+                yield clique
+            continue
+
+        # Pivote con más vecinos pendientes para reducir ramas
+        pivot = max(iter_bits(pending | excluded), key=lambda u: (pending & neighbours[u]).bit_count())
+        for v in iter_bits(pending & ~neighbours[pivot]):
+            bit = 1 << v
+            stack.append((clique | bit, pending & neighbours[v], excluded & neighbours[v]))
+            pending &= ~bit
+            excluded |= bit
+
+
+def enumerate_maximal_pairs(causal_matrix, choice_matrix):
+    """Enumera los pares maximales (A, B) del algoritmo Alpha.
+
+    Un par (A, B) es válido si todo a de A precede causalmente a todo b de B
+    y tanto A como B son conjuntos de actividades mutuamente en elección (#).
+    Se construye un grafo con una copia de entrada y otra de salida de cada
+    actividad (# dentro de cada lado, → entre lados): los pares maximales
+    son exactamente sus cliques maximales con ambos lados no vacíos, que se
+    buscan con Bron–Kerbosch sobre máscaras de bits. Cada clique se obtiene
+    una sola vez, a partir de su primera actividad de entrada. Devuelve una
+    lista ordenada de tuplas (ids_A, ids_B).
+    """
+    size = causal_matrix.shape[0]
+    successors = [mask_from_row(causal_matrix[i]) for i in range(size)]
+    predecessors = [mask_from_row(causal_matrix[:, j]) for j in range(size)]
+    # Vecinos en la relación # (sin la propia actividad)
+    independent = [mask_from_row(choice_matrix[i]) & ~(1 << i) for i in range(size)]
+
+    # Vértices 0..n-1: lado de entrada A; n..2n-1: lado de salida B
+    neighbours = [independent[i] | (successors[i] << size) for i in range(size)]
+    neighbours += [predecessors[j] | (independent[j] << size) for j in range(size)]
+    inputs_mask = (1 << size) - 1
+    outputs_mask = inputs_mask << size
+
+    pairs = []
+    for a in range(size):
+        if not successors[a]:
+            continue
+
+        # Solo pueden acompañar a a las entradas que comparten algún sucesor con ella
+        reach = 0
+        for b in iter_bits(successors[a]):
+            reach |= predecessors[b]
+        shared = independent[a] & reach
+        later = shared & ~((1 << (a + 1)) - 1)
+        earlier = shared & ((1 << a) - 1)
+
+        for clique in maximal_cliques(later | (successors[a] << size), neighbours,
+                                      excluded=earlier, clique=1 << a, required=outputs_mask):
+            pairs.append((ids_from_mask(clique & inputs_mask), ids_from_mask(clique >> size)))
+
+    pairs.sort()
+    return pairs
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+
+
+def log_fingerprint(variants, extra=()):
+    """Huella canónica de un multiconjunto de variantes (independiente del orden)"""
+    digest = hashlib.blake2b(digest_size=20)
+    for part in extra:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\x00')
+
+    # Ordenar las variantes para que logs equivalentes den la misma huella
+    for trace, count in sorted(variants.items()):
+        digest.update('\x1f'.join(trace).encode('utf-8'))
+        digest.update(b'\x1e%d\x1d' % count)
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """Caché de modelos minados con una LRU en memoria y un nivel opcional en disco.
+
+    Los modelos se guardan serializados, de modo que modificar un minero
+    tras recuperarlo no altera la entrada almacenada. El nivel en disco
+    expulsa los ficheros usados hace más tiempo al superar max_disk_bytes.
+    """
+
+    def __init__(self, max_entries=128, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __contains__(self, key):
+        return key in self._memory or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """Devuelve el estado minado asociado a la huella o None si no está"""
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+        elif self.directory is not None:
+            data = self._read_disk(key)
+            if data is not None:
+                self.disk_hits += 1
+                self._remember(key, data)
+
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key, state):
+        """Almacena el estado minado en memoria y, si está configurado, en disco"""
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, data)
+        if self.directory is not None:
+            self._write_disk(key, data)
+        return self
+
+    def clear(self):
+        self._memory.clear()
+        self.hits = self.misses = self.disk_hits = 0
+        return self
+
+    def stats(self):
+        """Contadores de aciertos y fallos de la caché"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._memory),
+        }
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return None
+        # Marcar el fichero como usado recientemente para la expulsión
+        os.utime(path)
+        return data
+
+    def _write_disk(self, key, data):
+        path = self._path(key)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, path)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Elimina los ficheros menos usados hasta respetar max_disk_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
@@ -0,0 +1,196 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+# Cabecera fija: firma, versión del formato y longitud de la cabecera JSON
+MAGIC = b'ALPHAMDL'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sHHI')
+# Alineación de cada sección binaria (permite mapearlas directamente en memoria)
+ALIGNMENT = 64
+
+# Direcciones de los arcos en la tabla de flujos
+_TO_PLACE, _FROM_PLACE = 0, 1
+
+
+class ModelFormatError(ValueError):
+    """Fichero de modelo con firma, versión o secciones no válidas"""
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _ragged(groups):
+    """Codifica una lista de listas de enteros como (desplazamientos, valores)"""
+    offsets = np.zeros(len(groups) + 1, dtype='<i8')
+    offsets[1:] = np.cumsum([len(group) for group in groups])
+    values = np.fromiter((value for group in groups for value in group), dtype='<i4', count=int(offsets[-1]))
+    return offsets, values
+
+
+def _unragged(offsets, values):
+    values = values.tolist()
+    bounds = offsets.tolist()
+    return [values[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def _sides(pattern):
+    return [[side] if isinstance(side, str) else list(side) for side in pattern]
+
+
+def save_model(miner, path, include_variants=True):
+    """Guarda el modelo minado en un fichero binario compacto y versionado.
+
+    Contiene la tabla de actividades, la matriz de sucesiones, los códigos de
+    la huella, los lugares (pares maximales) y los flujos; con
+    include_variants también las variantes del log, necesarias para reanudar
+    la minería incremental con la misma huella del log.
+    """
+    index = miner.activity_index
+    sections = {
+        'succession_matrix': np.ascontiguousarray(miner.succession_matrix, dtype='<i8'),
+        'footprint_codes': np.ascontiguousarray(miner.footprint.codes, dtype='<i1'),
+    }
+
+    # Lugares de Y_L como listas de identificadores; Il y Ol se deducen de las tareas de frontera
+    patterns = [_sides(pattern) for pattern in miner.maximal_patterns]
+    sections['place_input_offsets'], sections['place_inputs'] = _ragged(
+        [[index[act] for act in inputs] for inputs, _ in patterns])
+    sections['place_output_offsets'], sections['place_outputs'] = _ragged(
+        [[index[act] for act in outputs] for _, outputs in patterns])
+
+    # Arcos desde la lista de lugares, como en Alpha.generate_flow_relations: una
+    # actividad puede llamarse igual que un lugar ('p1'), así que no se deducen de los nombres
+    flows = []
+    for place, (inputs, outputs) in enumerate(miner.places):
+        flows.extend((_TO_PLACE, index[act], place) for act in sorted(inputs) if act != 'Il')
+        flows.extend((_FROM_PLACE, index[act], place) for act in sorted(outputs) if act != 'Ol')
+    sections['flows'] = np.array(flows, dtype='<i4').reshape(len(flows), 3)
+
+    if include_variants:
+        traces = list(miner.variants.items())
+        sections['variant_offsets'], sections['variant_events'] = _ragged(
+            [[index[act] for act in trace] for trace, _ in traces])
+        sections['variant_counts'] = np.array([count for _, count in traces], dtype='<i8')
+
+    header = {
+        'activities': list(miner.activity_set),
+        'entry_tasks': [index[act] for act in miner.entry_tasks],
+        'exit_tasks': [index[act] for act in miner.exit_tasks],
+        'thresholds': miner.thresholds(),
+        'pruned': dict(miner.pruned),
+        'sections': {},
+    }
+    # Calcular los desplazamientos: la cabecera se reescribe hasta que su tamaño es estable
+    layout = None
+    while True:
+        encoded = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        offset = _aligned(_PREAMBLE.size + len(encoded))
+        candidate = {}
+        for name, array in sections.items():
+            candidate[name] = [offset, array.dtype.str, list(array.shape)]
+            offset = _aligned(offset + array.nbytes)
+        if candidate == layout:
+            break
+        layout = header['sections'] = candidate
+
+    temporary = f"{os.fspath(path)}.tmp"
+    with open(temporary, 'wb') as handle:
+        handle.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(encoded)))
+        handle.write(encoded)
+        for name, array in sections.items():
+            handle.write(b'\x00' * (layout[name][0] - handle.tell()))
+            handle.write(array.tobytes())
+    os.replace(temporary, path)
+    return path
+
+
+def read_header(path):
+    """Lee y valida la cabecera de un fichero de modelo"""
+    with open(path, 'rb') as handle:
+        preamble = handle.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ModelFormatError(f"{path}: fichero de modelo truncado")
+        magic, version, _, length = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ModelFormatError(f"{path}: no es un fichero de modelo Alpha")
+        if version > FORMAT_VERSION:
+            raise ModelFormatError(f"{path}: versión de formato {version} no soportada (máxima {FORMAT_VERSION})")
+        try:
+            return json.loads(handle.read(length).decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            raise ModelFormatError(f"{path}: cabecera del modelo dañada") from None
+
+
+def read_sections(path, header, mmap=True):
+    """Carga las secciones binarias; con mmap, como mapas de memoria copia-en-escritura"""
+    size = os.path.getsize(path)
+    arrays = {}
+    for name, (offset, dtype, shape) in header['sections'].items():
+        count = int(np.prod(shape, dtype=np.int64))
+        if offset + count * np.dtype(dtype).itemsize > size:
+            raise ModelFormatError(f"{path}: sección '{name}' truncada")
+        if mmap and count:
+            # 'c': las escrituras (minería incremental) no modifican el fichero
+            arrays[name] = np.memmap(path, dtype=dtype, mode='c', offset=offset, shape=tuple(shape))
+        else:
+            arrays[name] = np.fromfile(path, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return arrays
+
+
+def load_model(path, miner, mmap=True, variants=True):
+    """Restaura en miner el modelo guardado con save_model y devuelve miner.
+
+    Las relaciones se leen directamente de los códigos de la huella, sin
+    volver a leer ni minar el log. Con variants=False no se
+    decodifican las variantes (carga más rápida, sin minería incremental).
+    """
+    from footprint import Footprint
+
+    header = read_header(path)
+    arrays = read_sections(path, header, mmap)
+    activities = header['activities']
+
+    # Los umbrales con los que se minó el modelo se conservan para la minería incremental
+    miner.set_thresholds(**header.get('thresholds', {}))
+    miner.activity_set = list(activities)
+    miner.activity_index = {act: i for i, act in enumerate(activities)}
+    miner.succession_matrix = arrays['succession_matrix']
+    miner.footprint = Footprint(activities, arrays['footprint_codes'])
+    # Las sucesiones a>b se derivan de la matriz solo si se consultan
+    miner.direct_successions = None
+    if 'pruned' in header:
+        miner.pruned = dict(header['pruned'])
+    else:
+        miner._count_pruned()
+    miner.entry_tasks = [activities[i] for i in header['entry_tasks']]
+    miner.exit_tasks = [activities[i] for i in header['exit_tasks']]
+    miner.pattern_pairs = sorted(miner.causal_relations)
+
+    inputs = _unragged(arrays['place_input_offsets'], arrays['place_inputs'])
+    outputs = _unragged(arrays['place_output_offsets'], arrays['place_outputs'])
+    miner.maximal_patterns = [(miner._pattern_side(a), miner._pattern_side(b)) for a, b in zip(inputs, outputs)]
+    miner.places = [(miner._names(a), miner._names(b)) for a, b in zip(inputs, outputs)]
+    miner.places.append((['Il'], list(miner.entry_tasks)))
+    miner.places.append((list(miner.exit_tasks), ['Ol']))
+    miner.place_labels = [miner.format_place_label(pattern) for pattern in miner.maximal_patterns] + ['Il', 'Ol']
+    miner.flow_relations = [
+        (activities[act], f"p{place}") if direction == _TO_PLACE else (f"p{place}", activities[act])
+        for direction, act, place in arrays['flows'].tolist()
+    ]
+
+    miner.variants.clear()
+    if variants and 'variant_counts' in arrays:
+        traces = _unragged(arrays['variant_offsets'], arrays['variant_events'])
+        for trace, count in zip(traces, arrays['variant_counts'].tolist()):
+            miner.variants[tuple(activities[i] for i in trace)] = count
+
+    miner.fingerprint = None
+    miner.cache_hit = False
+    miner.last_update = {}
+    miner._pending_cells = set()
+    miner._new_activities = set()
+    return miner
@@ -0,0 +1,195 @@
+from collections import deque
+from contextlib import contextmanager
+from html import escape
+
+# Separación entre capas y entre nodos de una misma capa (unidades SVG)
+LAYER_GAP = 120
+ROW_GAP = 70
+MARGIN = 60
+PLACE_RADIUS = 16
+# Pasadas de la heurística del baricentro para ordenar cada capa
+ORDER_SWEEPS = 4
+
+
+def place_label(inputs, outputs):
+    """Etiqueta de un lugar: Il, Ol o p({entradas},{salidas})"""
+    if "Il" in inputs:
+        return "Il"
+    if "Ol" in outputs:
+        return "Ol"
+    return f"p({{{', '.join(sorted(inputs))}}},{{{', '.join(sorted(outputs))}}})"
+
+
+def net_graph(miner):
+    """Nodos (id, tipo, etiqueta) y aristas de la red de Petri minada"""
+    nodes = [(act, 'activity', act) for act in miner.activity_set]
+    nodes += [(f"p{idx}", 'place', place_label(inputs, outputs)) for idx, (inputs, outputs) in enumerate(miner.places)]
+    return nodes, list(miner.flow_relations)
+
+
+def layered_layout(miner):
+    """Disposición determinista por capas de izquierda a derecha.
+
+    Las capas se asignan por distancia (BFS) desde el lugar inicial y las
+    tareas de entrada; el lugar final se coloca siempre en la última capa,
+    tras las tareas de salida. Dentro de cada capa los nodos se ordenan con
+    unas pocas pasadas del baricentro de sus vecinos en la capa anterior o
+    siguiente. Coste lineal en nodos y arcos por pasada, frente al coste
+    cuadrático e iterativo de un layout de muelles. Devuelve {nodo: (capa, fila)}.
+    """
+    nodes, edges = net_graph(miner)
+    successors = {node: [] for node, _, _ in nodes}
+    predecessors = {node: [] for node, _, _ in nodes}
+    for src, dst in edges:
+        successors[src].append(dst)
+        predecessors[dst].append(src)
+
+    initial = [node for node, kind, label in nodes if kind == 'place' and label == 'Il']
+    final = {node for node, kind, label in nodes if kind == 'place' and label == 'Ol'}
+    seeds = initial + [act for act in miner.entry_tasks if act not in initial]
+
+    # Capas por BFS; los nodos no alcanzables se siembran después en orden
+    layer = {}
+    for seed in seeds + [node for node, _, _ in nodes]:
+        if seed in layer or seed in final:
+            continue
+        start = 0 if seed in initial else max(1, min((layer[p] + 1 for p in predecessors[seed] if p in layer),
+                                                     default=1))
+        layer[seed] = start
+        queue = deque([seed])
+        while queue:
+            node = queue.popleft()
+            for nxt in successors[node]:
+                if nxt not in layer and nxt not in final:
+                    layer[nxt] = layer[node] + 1
+                    queue.append(nxt)
+    last = max(layer.values(), default=0) + 1
+    for node in final:
+        layer[node] = last
+
+    layers = [[] for _ in range(last + 1)]
+    for node, _, _ in nodes:
+        layers[layer[node]].append(node)
+
+    # Ordenar cada capa por el baricentro de sus vecinos ya colocados
+    row = {}
+    for nodes_in_layer in layers:
+        for position, node in enumerate(nodes_in_layer):
+            row[node] = position
+    for sweep in range(ORDER_SWEEPS):
+        forward = sweep % 2 == 0
+        neighbours = predecessors if forward else successors
+        sequence = layers[1:] if forward else layers[-2::-1]
+        for nodes_in_layer in sequence:
+            def barycenter(node):
+                placed = [row[other] for other in neighbours[node] if layer[other] != layer[node]]
+                return (sum(placed) / len(placed) if placed else row[node], row[node])
+            nodes_in_layer.sort(key=barycenter)
+            for position, node in enumerate(nodes_in_layer):
+                row[node] = position
+
+    return {node: (layer[node], row[node]) for node in layer}
+
+
+@contextmanager
+def _output(target):
+    """Admite una ruta o un objeto fichero de texto ya abierto"""
+    if hasattr(target, 'write'):
+        yield target
+    else:
+        with open(target, 'w', encoding='utf-8') as handle:
+            yield handle
+
+
+def _dot_id(node):
+    return '"' + node.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def write_dot(miner, target):
+    """Escribe la red en formato DOT (Graphviz), nodo a nodo, con las capas como rank=same"""
+    nodes, edges = net_graph(miner)
+    layout = layered_layout(miner)
+    with _output(target) as out:
+        out.write("digraph petri_net {\n  rankdir=LR;\n")
+        for node, kind, label in nodes:
+            if kind == 'activity':
+                out.write(f"  {_dot_id(node)} [shape=box, style=filled, fillcolor=lightgreen];\n")
+            else:
+                out.write(f"  {_dot_id(node)} [shape=circle, style=filled, fillcolor=lightblue, "
+                          f"label=\"\", xlabel={_dot_id(label)}];\n")
+
+        layers = {}
+        for node, (index, _) in sorted(layout.items(), key=lambda item: item[1]):
+            layers.setdefault(index, []).append(node)
+        for index in sorted(layers):
+            out.write(f"  {{ rank=same; {' '.join(_dot_id(node) for node in layers[index])} }}\n")
+
+        for src, dst in edges:
+            out.write(f"  {_dot_id(src)} -> {_dot_id(dst)};\n")
+        out.write("}\n")
+    return target
+
+
+def write_svg(miner, target):
+    """Escribe la red como SVG con la disposición por capas, sin librerías gráficas"""
+    nodes, edges = net_graph(miner)
+    layout = layered_layout(miner)
+    position = {node: (MARGIN + index * LAYER_GAP, MARGIN + order * ROW_GAP)
+                for node, (index, order) in layout.items()}
+    kinds = {node: kind for node, kind, _ in nodes}
+    width = max((x for x, _ in position.values()), default=0) + 2 * MARGIN
+    height = max((y for _, y in position.values()), default=0) + 2 * MARGIN
+
+    with _output(target) as out:
+        out.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                  f'viewBox="0 0 {width} {height}" font-family="sans-serif">\n'
+                  '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+                  'markerHeight="8" orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z"/></marker></defs>\n'
+                  '<title>Red de Petri - Algoritmo Alpha</title>\n')
+
+        # Los arcos hacia atrás (bucles) se curvan por debajo para no cruzar los nodos
+        for src, dst in edges:
+            (x1, y1), (x2, y2) = position[src], position[dst]
+            if x2 > x1:
+                x1, x2 = x1 + _half_width(kinds[src]), x2 - _half_width(kinds[dst])
+                out.write(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="black" marker-end="url(#arrow)"/>\n')
+            else:
+                y1, y2 = y1 + _half_height(kinds[src]), y2 + _half_height(kinds[dst])
+                bend = max(y1, y2) + ROW_GAP / 2 + abs(x1 - x2) / 4
+                out.write(f'<path d="M{x1},{y1} Q{(x1 + x2) / 2},{bend} {x2},{y2}" fill="none" stroke="gray" '
+                          f'stroke-dasharray="4,3" marker-end="url(#arrow)"/>\n')
+
+        for node, kind, label in nodes:
+            x, y = position[node]
+            if kind == 'activity':
+                half = _half_width(kind)
+                out.write(f'<rect x="{x - half}" y="{y - 14}" width="{2 * half}" height="28" fill="lightgreen" '
+                          f'stroke="black"/>\n<text x="{x}" y="{y + 5}" text-anchor="middle" font-size="12" '
+                          f'font-weight="bold">{escape(label, quote=False)}</text>\n')
+            else:
+                out.write(f'<circle cx="{x}" cy="{y}" r="{PLACE_RADIUS}" fill="lightblue" stroke="black">'
+                          f'<title>{escape(label, quote=False)}</title></circle>\n<text x="{x}" y="{y - PLACE_RADIUS - 4}" '
+                          f'text-anchor="middle" font-size="8" fill="darkblue">'
+                          f'{escape(label, quote=False)}</text>\n')
+        out.write('</svg>\n')
+    return target
+
+
+def _half_width(kind):
+    return 30 if kind == 'activity' else PLACE_RADIUS
+
+
+def _half_height(kind):
+    return 14 if kind == 'activity' else PLACE_RADIUS
+
+
+def render(miner, target, format=None):
+    """Escribe la red en DOT o SVG; el formato se deduce de la extensión si no se indica"""
+    if format is None:
+        suffix = str(getattr(target, 'name', target)).rsplit('.', 1)[-1].lower()
+        format = 'dot' if suffix in ('dot', 'gv') else 'svg'
+    if format == 'dot':
+        return write_dot(miner, target)
+    if format == 'svg':
+        return write_svg(miner, target)
+    raise ValueError(f"Formato de renderizado no soportado: {format} (use 'dot' o 'svg')")
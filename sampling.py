@@ -0,0 +1,257 @@
+from collections import Counter
+import os
+
+import numpy as np
+
+from log_reader import DEFAULT_CHUNK_SIZE, RESYNC_MIN_WINDOW, iter_event_log_range, shard_ranges
+
+# Entradas del log (variantes o trazas <...>^n) que se leen entre dos comprobaciones de convergencia
+DEFAULT_BATCH_SIZE = 1000
+# Estratos (tramos consecutivos del log) entre los que se reparte la muestra
+DEFAULT_STRATA = 64
+# Bytes mínimos por estrato, en ventanas de resincronización de su inicio (ver log_reader.shard_ranges)
+STRATUM_WINDOWS = 16
+DEFAULT_CONFIDENCE = 0.99
+DEFAULT_MIN_TRACES = 1000
+ORDERS = ('stratified', 'random')
+
+# Marcas de inicio y fin de traza: (None, a) y (a, None) entran en el soporte como sucesiones
+_BOUNDARY = None
+
+
+class SupportTracker:
+    """Soporte de sucesiones directas de una muestra y su convergencia.
+
+    El soporte incluye los pares a>b y el inicio y fin de cada traza (de los
+    que dependen las tareas de entrada y salida). La unidad de muestreo es
+    la entrada del log (una variante <...>^n cuenta una vez, sea cual sea n):
+    para cada par se cuenta en cuántas entradas muestreadas aparece, y los
+    pares vistos en una sola entrada dan la estimación de Good-Turing (por
+    incidencia) del número esperado de pares nuevos en la siguiente entrada:
+    expected_new_pairs = singletons / entradas. No es una probabilidad y
+    puede superar 1, pero la acota (desigualdad de Markov): la probabilidad
+    de que la siguiente entrada aporte algún par nuevo es como mucho
+    expected_new_pairs. Contar por trazas, con la multiplicidad, haría que un
+    par nuevo visto en una variante ^n>1 nunca fuera singleton.
+    """
+
+    def __init__(self, confidence=DEFAULT_CONFIDENCE, patience=None, min_traces=DEFAULT_MIN_TRACES):
+        if confidence is not None and not 0.0 < confidence < 1.0:
+            raise ValueError(f"confidence debe estar en (0, 1), recibido {confidence}")
+        if patience is not None and patience < 1:
+            raise ValueError(f"patience debe ser un entero positivo, recibido {patience}")
+        if confidence is None and patience is None:
+            raise ValueError("Se necesita al menos una regla de parada: confidence o patience")
+        self.confidence = confidence
+        self.patience = patience
+        self.min_traces = min_traces
+        self.support = Counter()
+        self.traces = 0
+        self.entries = 0
+        self.singletons = 0
+        self.batches = 0
+        self.stable_batches = 0
+        self.stop_rule = None
+
+    def add(self, trace, count):
+        """Registra una variante muestreada; devuelve cuántos pares nuevos aporta"""
+        if count <= 0:
+            return 0
+        pairs = set(zip(trace, trace[1:]))
+        if trace:
+            pairs.add((_BOUNDARY, trace[0]))
+            pairs.add((trace[-1], _BOUNDARY))
+        new = 0
+        for pair in pairs:
+            seen = self.support[pair]
+            if seen == 0:
+                new += 1
+                self.singletons += 1
+            elif seen == 1:
+                self.singletons -= 1
+            self.support[pair] = seen + 1
+        self.entries += 1
+        self.traces += count
+        return new
+
+    def add_batch(self, batch):
+        """Registra un lote y comprueba las reglas de parada; devuelve True si la muestra ha convergido"""
+        new = sum(self.add(trace, count) for trace, count in batch)
+        self.batches += 1
+        self.stable_batches = 0 if new else self.stable_batches + 1
+        return self.converged()
+
+    @property
+    def expected_new_pairs(self):
+        return self.singletons / self.entries if self.entries else 1.0
+
+    def converged(self):
+        if self.traces < self.min_traces or not self.stable_batches:
+            return False
+        if self.confidence is not None and self.expected_new_pairs <= 1.0 - self.confidence:
+            self.stop_rule = 'confidence'
+        elif self.patience is not None and self.stable_batches >= self.patience:
+            self.stop_rule = 'patience'
+        return self.stop_rule is not None
+
+    def report(self):
+        return {
+            'batches': self.batches,
+            'traces_read': self.traces,
+            'entries_read': self.entries,
+            'support': len(self.support),
+            'expected_new_pairs': self.expected_new_pairs,
+            'converged': self.stop_rule is not None,
+            'stop_rule': self.stop_rule,
+        }
+
+
+def _check_order(order):
+    if order not in ORDERS:
+        raise ValueError(f"Orden de muestreo no soportado: {order} (use {' o '.join(ORDERS)})")
+
+
+def variant_batches(variants, batch_size=DEFAULT_BATCH_SIZE, order='stratified', strata=DEFAULT_STRATA, seed=None):
+    """Lotes de (traza, frecuencia) de unas variantes en memoria, en orden de muestreo.
+
+    'random' recorre las variantes en una permutación aleatoria ponderada por
+    su frecuencia (claves u^(1/f) de Efraimidis-Spirakis); 'stratified' divide
+    el log, en su orden, en strata tramos y toma un lote de cada tramo por
+    turnos, de modo que la muestra cubre pronto todo el log.
+    """
+    _check_order(order)
+    items = list(variants.items())
+    rng = np.random.default_rng(seed)
+    if order == 'random':
+        counts = np.fromiter((count for _, count in items), dtype=np.float64, count=len(items))
+        keys = rng.random(len(items)) ** (1.0 / np.maximum(counts, 1.0))
+        permutation = np.argsort(-keys).tolist()
+        for start in range(0, len(items), batch_size):
+            yield [items[idx] for idx in permutation[start:start + batch_size]]
+        return
+
+    strata = max(1, min(strata, len(items) or 1))
+    bounds = [len(items) * idx // strata for idx in range(strata + 1)]
+    cursors = dict(enumerate(zip(bounds, bounds[1:])))
+    visit = rng.permutation(strata).tolist()
+    while visit:
+        remaining = []
+        for stratum in visit:
+            start, end = cursors[stratum]
+            yield items[start:min(end, start + batch_size)]
+            if start + batch_size < end:
+                cursors[stratum] = (start + batch_size, end)
+                remaining.append(stratum)
+        visit = remaining
+
+
+class _FileSampler:
+    """Lotes de un fichero [<a,b>^n, ...] leídos de strata rangos de bytes.
+
+    Cada rango se lee de forma secuencial desde su inicio; 'stratified'
+    toma un lote de cada rango por turnos y 'random' elige en cada lote un
+    rango al azar entre los que quedan. Solo se analiza lo que se lee, así
+    que al parar pronto el resto del fichero no se toca; los bytes leídos
+    incluyen los de la resincronización de los inicios de rango.
+    """
+
+    def __init__(self, path, batch_size, order, strata, seed, chunk_size):
+        _check_order(order)
+        self.size = os.path.getsize(path)
+        self.batch_size = batch_size
+        self.order = order
+        self.rng = np.random.default_rng(seed)
+        # En ficheros pequeños, menos estratos: resincronizar sus inicios no debe costar más que leerlos
+        strata = max(1, min(strata, self.size // (STRATUM_WINDOWS * RESYNC_MIN_WINDOW)))
+        stats = {}
+        ranges = shard_ranges(path, strata, stats)
+        self.ranges = ranges
+        self.bytes_scanned = stats['bytes_scanned']
+        self.readers = [iter_event_log_range(path, start, end, chunk_size) for start, end in ranges]
+        # Posición hasta la que se ha leído cada rango
+        self.positions = [start for start, _ in ranges]
+
+    def bytes_read(self):
+        return self.bytes_scanned + sum(position - start for position, (start, _) in zip(self.positions, self.ranges))
+
+    def _take(self, stratum):
+        batch = []
+        for activities, multiplier, offset in self.readers[stratum]:
+            self.positions[stratum] = offset
+            if multiplier > 0:
+                batch.append((tuple(activities), multiplier))
+            if len(batch) >= self.batch_size:
+                return batch, False
+        self.positions[stratum] = self.ranges[stratum][1]
+        return batch, True
+
+    def __iter__(self):
+        open_strata = self.rng.permutation(len(self.readers)).tolist()
+        while open_strata:
+            if self.order == 'random':
+                stratum = open_strata[int(self.rng.integers(len(open_strata)))]
+                batch, exhausted = self._take(stratum)
+                if exhausted:
+                    open_strata.remove(stratum)
+                yield batch
+                continue
+            remaining = []
+            for stratum in open_strata:
+                batch, exhausted = self._take(stratum)
+                if not exhausted:
+                    remaining.append(stratum)
+                yield batch
+            open_strata = remaining
+
+    def close(self):
+        for reader in self.readers:
+            reader.close()
+
+
+def sample_log(source, confidence=DEFAULT_CONFIDENCE, patience=None, batch_size=DEFAULT_BATCH_SIZE,
+               order='stratified', strata=DEFAULT_STRATA, seed=None, min_traces=DEFAULT_MIN_TRACES,
+               chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lee un log por lotes en orden de muestreo hasta que su soporte converge.
+
+    source es una ruta de un log [<a,b>^n, ...] o un diccionario de
+    variantes traza -> frecuencia. Tras cada lote se comprueban las reglas de
+    parada (ver SupportTracker): con confidence, que el número esperado de
+    pares nuevos en la siguiente entrada (cota de la probabilidad de ver
+    alguno) sea como mucho 1 - confidence; con patience, que pasen ese
+    número de lotes seguidos sin pares nuevos. Ninguna se aplica antes de
+    min_traces trazas ni si el último lote aportó pares nuevos. Devuelve
+    (variantes leídas, informe con la fracción del log leída).
+    """
+    tracker = SupportTracker(confidence, patience, min_traces)
+    sample = Counter()
+    if hasattr(source, 'items'):
+        batches = variant_batches(source, batch_size, order, strata, seed)
+        sampler = None
+    else:
+        batches = sampler = _FileSampler(source, batch_size, order, strata, seed, chunk_size)
+
+    try:
+        for batch in batches:
+            if not batch:
+                # Un rango sin trazas no es evidencia de convergencia
+                continue
+            for trace, count in batch:
+                sample[trace] += count
+            if tracker.add_batch(batch):
+                break
+    finally:
+        if sampler is not None:
+            sampler.close()
+
+    report = {'order': order, 'seed': seed, **tracker.report()}
+    if sampler is None:
+        total = sum(source.values())
+        report['traces_total'] = total
+        report['variants_read'] = len(sample)
+        report['variants_total'] = len(source)
+        report['fraction_read'] = tracker.traces / total if total else 1.0
+    else:
+        report['bytes_total'] = sampler.size
+        report['bytes_read'] = sampler.bytes_read()
+        report['fraction_read'] = min(1.0, report['bytes_read'] / sampler.size) if sampler.size else 1.0
+    return sample, report
@@ -0,0 +1,248 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import sys
+import time
+
+from batch import mine_log
+from model_cache import ModelCache
+
+# Umbrales de ruido que se aceptan en las peticiones (ver Alpha.set_thresholds)
+THRESHOLD_OPTIONS = ('min_count', 'min_relative', 'min_dependency')
+
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_BODY_BYTES = 64 * 1024 * 1024
+# Últimas latencias conservadas para los percentiles
+LATENCY_WINDOW = 1000
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class ServiceBusy(RuntimeError):
+    """La cola de minería está llena: el cliente debe reintentar más tarde"""
+
+
+def request_fingerprint(log_text, options):
+    """Huella de una petición: texto del log y opciones que afectan al modelo"""
+    digest = hashlib.blake2b(log_text.encode('utf-8'), digest_size=20)
+    digest.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class MiningService:
+    """Servicio local asíncrono que mina logs y devuelve los modelos en JSON.
+
+    La minería (CPU) se ejecuta en un pool de procesos fuera del bucle de
+    eventos. Las peticiones idénticas en curso se fusionan en una sola
+    minería y los modelos recientes se sirven desde una ModelCache. Si hay
+    max_pending minerías distintas en curso, las nuevas se rechazan con 503
+    (contrapresión) en lugar de encolarse sin límite.
+
+    Rutas HTTP: POST /mine (log en texto plano, o JSON {"log": ...,
+    "footprint": bool, "min_count": ..., ...}), GET /stats y GET /health.
+    """
+
+    def __init__(self, workers=None, max_pending=DEFAULT_MAX_PENDING, max_body_bytes=DEFAULT_MAX_BODY_BYTES,
+                 cache_entries=128, executor=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_body_bytes = max_body_bytes
+        self.cache = ModelCache(max_entries=cache_entries) if cache_entries else None
+        self.executor = executor
+        self._inflight = {}
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.started = time.monotonic()
+        self.requests = 0
+        self.mined = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.errors = 0
+
+    async def mine(self, log_text, options=None):
+        """Devuelve el modelo del log; fusiona peticiones idénticas en curso"""
+        options = dict(options or {})
+        key = request_fingerprint(log_text, options)
+        if self.cache is not None:
+            model = self.cache.get(key)
+            if model is not None:
+                return model
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if len(self._inflight) >= self.max_pending:
+                self.rejected += 1
+                raise ServiceBusy(f"cola de minería llena ({self.max_pending} en curso)")
+            thresholds = {name: options[name] for name in THRESHOLD_OPTIONS if name in options}
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, mine_log, log_text,
+                                          bool(options.get('footprint')), thresholds)
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # shield: si un cliente se desconecta, la minería sigue para los demás
+        return await asyncio.shield(future)
+
+    def _finish(self, key, future):
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.mined += 1
+            if self.cache is not None:
+                self.cache.put(key, future.result())
+
+    def stats(self):
+        """Contadores, latencias (segundos) y rendimiento desde el arranque"""
+        uptime = time.monotonic() - self.started
+        latencies = list(self._latencies)
+        return {
+            'uptime_seconds': uptime,
+            'requests': self.requests,
+            'mined': self.mined,
+            'coalesced': self.coalesced,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'in_flight': len(self._inflight),
+            'throughput_rps': self.requests / uptime if uptime else 0.0,
+            'latency': {
+                'count': len(latencies),
+                'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+                'p50': _percentile(latencies, 0.50),
+                'p95': _percentile(latencies, 0.95),
+                'p99': _percentile(latencies, 0.99),
+            },
+            'cache': self.cache.stats() if self.cache is not None else None,
+        }
+
+    def _parse_body(self, body, headers):
+        """Texto del log y opciones a partir del cuerpo de POST /mine"""
+        text = body.decode('utf-8')
+        if 'json' not in headers.get('content-type', ''):
+            return text, {}
+        document = json.loads(text)
+        if not isinstance(document, dict) or not isinstance(document.get('log'), str):
+            raise ValueError("el JSON debe tener la forma {\"log\": \"[<a,b>, ...]\", ...}")
+        options = {name: document[name] for name in ('footprint',) + THRESHOLD_OPTIONS if name in document}
+        return document['log'], options
+
+    async def dispatch(self, method, path, body, headers):
+        """Atiende una petición ya leída y devuelve (estado, documento JSON)"""
+        path = path.split('?', 1)[0]
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, self.stats()
+        if path != '/mine':
+            return 404, {'error': f"ruta desconocida: {path}"}
+        if method != 'POST':
+            return 405, {'error': "use POST /mine"}
+
+        try:
+            log_text, options = self._parse_body(body, headers)
+            return 200, await self.mine(log_text, options)
+        except ServiceBusy as e:
+            return 503, {'error': str(e)}
+        except (ValueError, TypeError) as e:
+            self.errors += 1
+            return 400, {'error': str(e)}
+
+    async def handle(self, reader, writer):
+        """Conexión HTTP/1.1 mínima: una petición por conexión"""
+        started = time.perf_counter()
+        self.requests += 1
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length') or 0)
+            if len(request_line) < 2:
+                status, document = 400, {'error': "línea de petición HTTP no válida"}
+            elif length > self.max_body_bytes:
+                status, document = 413, {'error': f"cuerpo mayor que {self.max_body_bytes} bytes"}
+            else:
+                body = await reader.readexactly(length) if length else b''
+                status, document = await self.dispatch(request_line[0].upper(), request_line[1], body, headers)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            self.errors += 1
+            status, document = 500, {'error': f"{type(e).__name__}: {e}"}
+
+        payload = json.dumps(document, ensure_ascii=False).encode('utf-8')
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+                "Content-Type: application/json; charset=utf-8",
+                f"Content-Length: {len(payload)}",
+                "Connection: close"]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._latencies.append(time.perf_counter() - started)
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """Arranca el servidor TCP (o en el socket Unix path) y lo devuelve"""
+        if self.executor is None:
+            # Con fork, los trabajadores creados bajo demanda heredarían los sockets de los clientes
+            # y las conexiones no se cerrarían; forkserver/spawn arrancan procesos limpios
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context(method))
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve_forever(self, host='127.0.0.1', port=8765, path=None):
+        server = await self.start(host, port, path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local de minería con el algoritmo Alpha")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="escucha en este socket Unix en lugar de TCP")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="procesos de minería (por defecto, CPUs)")
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING,
+                        help="minerías distintas en curso antes de responder 503")
+    parser.add_argument('--cache-entries', type=int, default=128, help="modelos recientes en memoria (0 = sin caché)")
+    args = parser.parse_args(argv)
+
+    service = MiningService(args.workers, args.max_pending, cache_entries=args.cache_entries)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Sirviendo en {where} (POST /mine, GET /stats)", file=sys.stderr)
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
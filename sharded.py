@@ -0,0 +1,111 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from log_reader import DEFAULT_CHUNK_SIZE, LogFormatError, iter_event_log_range, shard_ranges
+
+
+def empty_counts():
+    """Tabla parcial vacía: sucesiones, ocurrencias de actividades y variantes"""
+    return {'successions': Counter(), 'activities': Counter(), 'variants': Counter()}
+
+
+def count_variants(variants):
+    """Cuenta sucesiones directas y ocurrencias de actividades de unas variantes"""
+    counts = empty_counts()
+    successions, activities = counts['successions'], counts['activities']
+    for trace, count in variants.items():
+        for act in trace:
+            activities[act] += count
+        for pair in zip(trace, trace[1:]):
+            successions[pair] += count
+    counts['variants'] = Counter(variants)
+    return counts
+
+
+def merge_counts(target, partial):
+    """Suma una tabla parcial en target (operación asociativa) y devuelve target"""
+    for key in ('successions', 'activities', 'variants'):
+        target[key].update(partial[key])
+    return target
+
+
+def _count_file_range(task):
+    """Tarea de un trabajador: lee su rango de bytes del fichero y lo cuenta.
+
+    Además de la tabla devuelve en 'next' la posición de la primera traza
+    tras el rango, y en 'error' el LogFormatError si lo hubo (se decide en el
+    proceso principal si es válido, ver count_file).
+    """
+    path, start, end, chunk_size = task
+    variants = Counter()
+    reader = iter_event_log_range(path, start, end, chunk_size)
+    following, error = None, None
+    try:
+        while True:
+            activities, multiplier, _ = next(reader)
+            if multiplier > 0:
+                variants[tuple(activities)] += multiplier
+    except StopIteration as stop:
+        following = stop.value
+    except LogFormatError as exc:
+        error = exc
+    counts = count_variants(variants)
+    counts['next'], counts['error'] = following, error
+    return counts
+
+
+def _count_variant_shard(items):
+    return count_variants(Counter(dict(items)))
+
+
+def _run(function, tasks, workers):
+    if workers == 1 or len(tasks) == 1:
+        return list(map(function, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, tasks))
+
+
+def count_file(path, workers=None, shards=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Cuenta un fichero de log repartiendo rangos de bytes entre procesos.
+
+    Cada trabajador abre el fichero y lee solo su rango; las tablas parciales
+    se combinan en el orden de los rangos, así que el resultado (incluido el
+    orden de aparición de las variantes) es idéntico al de una sola pasada.
+    Los inicios de rango se resincronizan localmente (ver shard_ranges), y
+    se comprueban al combinar: cada rango debe empezar donde el anterior
+    encontró su primera traza siguiente. Si no es así (un inicio dentro de un
+    nombre entre comillas) el rango se vuelve a contar desde esa posición.
+    """
+    path = os.fspath(path)
+    workers = workers or os.cpu_count() or 1
+    ranges = shard_ranges(path, shards or workers)
+    partials = _run(_count_file_range, [(path, start, end, chunk_size) for start, end in ranges], workers)
+
+    counts = empty_counts()
+    expected = 0
+    for (start, end), partial in zip(ranges, partials):
+        if expected >= end:
+            # La traza que sigue al rango anterior ya está más allá de este
+            continue
+        if start != expected:
+            partial = _count_file_range((path, expected, end, chunk_size))
+        if partial['error'] is not None:
+            raise partial['error']
+        merge_counts(counts, partial)
+        expected = partial['next']
+    return counts
+
+
+def count_variants_parallel(variants, workers=None, shards=None):
+    """Cuenta en paralelo un multiconjunto de variantes ya cargado en memoria"""
+    workers = workers or os.cpu_count() or 1
+    items = list(variants.items())
+    shards = max(1, min(shards or workers, len(items) or 1))
+    tasks = [items[len(items) * idx // shards:len(items) * (idx + 1) // shards] for idx in range(shards)]
+    partials = _run(_count_variant_shard, tasks, workers)
+
+    counts = empty_counts()
+    for partial in partials:
+        merge_counts(counts, partial)
+    return counts
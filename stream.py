@@ -0,0 +1,135 @@
+from collections import Counter, OrderedDict
+import datetime
+import time
+
+# Trazas completadas que se acumulan antes de sumarlas a las sucesiones del minero
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _as_seconds(timestamp):
+    """Marca de tiempo (número, datetime o texto ISO-8601) en segundos"""
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.datetime.fromisoformat(timestamp)
+        except ValueError:
+            return float(timestamp)
+    if isinstance(timestamp, datetime.datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class TraceAssembler:
+    """Ensambla trazas por caso a partir de un flujo intercalado de eventos.
+
+    Cada evento (caso, actividad, marca) se añade a la traza abierta de su
+    caso. Un caso se completa al llegar una de end_activities o al pasar
+    timeout segundos sin eventos; las trazas completadas se suman por lotes
+    a las sucesiones del minero con add_traces(), y model() aplica update()
+    para consultar el modelo actual sin reprocesar el histórico.
+
+    La memoria queda acotada por max_open_cases: al superarlo se expulsa el
+    caso inactivo desde hace más tiempo, que se descarta o, con
+    complete_evicted, se trata como terminado. Los eventos de un caso se
+    conservan en orden de llegada.
+    """
+
+    def __init__(self, miner, end_activities=(), timeout=None, max_open_cases=None,
+                 complete_evicted=False, batch_size=DEFAULT_BATCH_SIZE):
+        self.miner = miner
+        self.end_activities = set(end_activities)
+        self.timeout = timeout
+        self.max_open_cases = max_open_cases
+        self.complete_evicted = complete_evicted
+        self.batch_size = batch_size
+        # Casos abiertos ordenados por su último evento: caso -> (última marca, actividades)
+        self._open = OrderedDict()
+        self._pending = Counter()
+        self._pending_traces = 0
+        self._dirty = False
+        self.clock = None
+        self.events = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.evicted = 0
+
+    def push(self, case, activity, timestamp=None):
+        """Añade un evento; devuelve las trazas [(caso, actividades)] que se completan"""
+        now = time.monotonic() if timestamp is None else _as_seconds(timestamp)
+        # El reloj del flujo solo avanza: un evento algo desordenado no lo hace retroceder
+        self.clock = now if self.clock is None else max(self.clock, now)
+        self.events += 1
+        finished = self.expire(self.clock)
+
+        _, activities = self._open.pop(case, (None, []))
+        activities.append(activity)
+        if activity in self.end_activities:
+            finished.append(self._complete(case, activities))
+        else:
+            self._open[case] = (self.clock, activities)
+            if self.max_open_cases is not None and len(self._open) > self.max_open_cases:
+                finished += self._evict()
+        return finished
+
+    def expire(self, now=None):
+        """Completa los casos sin eventos desde hace más de timeout segundos"""
+        if self.timeout is None:
+            return []
+        now = self.clock if now is None else _as_seconds(now)
+        finished = []
+        while self._open:
+            case, (last_seen, activities) = next(iter(self._open.items()))
+            if now - last_seen <= self.timeout:
+                break
+            del self._open[case]
+            self.timed_out += 1
+            finished.append(self._complete(case, activities))
+        return finished
+
+    def _evict(self):
+        case, (_, activities) = self._open.popitem(last=False)
+        self.evicted += 1
+        return [self._complete(case, activities)] if self.complete_evicted else []
+
+    def _complete(self, case, activities):
+        self.completed += 1
+        self._pending[tuple(activities)] += 1
+        self._pending_traces += 1
+        if self._pending_traces >= self.batch_size:
+            self._feed()
+        return case, activities
+
+    def _feed(self):
+        """Suma las trazas completadas a las sucesiones del minero"""
+        if self._pending:
+            self.miner.add_traces(self._pending)
+            self._pending = Counter()
+            self._pending_traces = 0
+            self._dirty = True
+        return self
+
+    def flush(self):
+        """Da por terminados todos los casos abiertos (fin del flujo)"""
+        finished = [self._complete(case, activities) for case, (_, activities) in self._open.items()]
+        self._open.clear()
+        return finished
+
+    def model(self):
+        """Minero actualizado con todas las trazas completadas hasta ahora"""
+        self._feed()
+        if self._dirty:
+            self.miner.update()
+            self._dirty = False
+        return self.miner
+
+    def stats(self):
+        return {
+            'events': self.events,
+            'open_cases': len(self._open),
+            'open_events': sum(len(activities) for _, activities in self._open.values()),
+            'completed': self.completed,
+            'timed_out': self.timed_out,
+            'evicted': self.evicted,
+            'pending_traces': self._pending_traces,
+        }
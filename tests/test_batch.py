@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+import batch
+from batch import mine_batch, mine_log
+
+LOGS = {'ruido': '[<a,b,c>^5, <a,c>]', 'roto': '[<a,b'}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_mine_batch_applies_options_to_every_log(workers):
+    results = mine_batch(LOGS, workers=workers, include_footprint=True, thresholds={'min_count': 2})
+    assert [result['name'] for result in results] == ['ruido', 'roto']
+    assert results[0]['model'] == mine_log(LOGS['ruido'], include_footprint=True, thresholds={'min_count': 2})
+    assert results[0]['model']['pruned']['absolute'] == 1
+    assert 'footprint' in results[0]['model']
+    assert not results[1]['ok']
+
+
+def test_batch_cli_forwards_thresholds(tmp_path, capsys):
+    path = tmp_path / 'log.txt'
+    path.write_text(LOGS['ruido'], encoding='utf-8')
+    assert batch.main([str(path), '--workers', '1', '--footprint', '--min-count', '2']) == 0
+    model = json.loads(capsys.readouterr().out)['model']
+    assert model['thresholds'] == {'min_count': 2}
+    assert 'footprint' in model
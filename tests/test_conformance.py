@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+
+from alpha import Alpha
+from conformance import TokenReplay
+
+
+def _net():
+    # Il -> a -> (b || c) -> d -> Ol
+    places = [({'Il'}, {'a'}), ({'a'}, {'b'}), ({'a'}, {'c'}), ({'b'}, {'d'}), ({'c'}, {'d'}), ({'d'}, {'Ol'})]
+    activities = ['a', 'b', 'c', 'd']
+    return SimpleNamespace(activity_set=activities, places=places,
+                           activity_index={act: idx for idx, act in enumerate(activities)})
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 4096])
+def test_replay_counts_tokens_on_hand_built_net(batch_size):
+    traces = {('a', 'c', 'b', 'd'): 3, ('a', 'b', 'd'): 1, ('a', 'a', 'b', 'c', 'd'): 1, ('a', 'x', 'b', 'c', 'd'): 2}
+    results = TokenReplay(_net()).replay_variants(traces, batch_size)
+    counts = [(r['missing'], r['remaining'], r['produced'], r['consumed'], r['unknown_activities'], r['fits'])
+              for r in results]
+    assert counts == [
+        (0, 0, 6, 6, 0, True),
+        # d no encuentra la ficha de c y la de a -> c queda sin consumir
+        (1, 1, 5, 5, 0, False),
+        # la segunda a no tiene ficha de entrada y deja dos sobrantes
+        (1, 2, 8, 7, 0, False),
+        (0, 0, 6, 6, 1, False),
+    ]
+    assert [r['fitness'] for r in results] == pytest.approx([1.0, 0.8, 0.5 * (6 / 7) + 0.5 * (6 / 8), 1.0])
+
+
+def test_replay_log_totals_are_weighted_by_frequency():
+    summary = TokenReplay(_net()).replay([['a', 'b', 'c', 'd'], ['a', 'b', 'c', 'd'], ['a', 'b', 'd']])['log']
+    assert (summary['traces'], summary['variants'], summary['fitting_traces']) == (3, 2, 2)
+    assert (summary['missing'], summary['remaining'], summary['produced'], summary['consumed']) == (1, 1, 17, 17)
+    assert summary['fitness'] == pytest.approx(1 - 1 / 17)
+
+
+def test_discovered_model_replays_its_own_log():
+    miner = Alpha().parse_event_log('[<a,b,c,d>^3, <a,c,b,d>^2, <a,e,d>]').discover_relations().execute_alpha_algorithm()
+    summary = miner.replay()['log']
+    assert summary['fitting_ratio'] == 1.0 and summary['fitness'] == 1.0
+    assert miner.replay([['a', 'd']])['log']['missing'] > 0
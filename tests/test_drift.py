@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from alpha import Alpha
+from drift import FootprintSeries
+
+WINDOWS = ['[<a,b,c>^3]', '[<a,b,c>]', '[<a,b,c>, <a,c,b>]', '[<a,d,c>]']
+
+
+@pytest.fixture
+def series():
+    return FootprintSeries.from_logs(WINDOWS, names=['w0', 'w1', 'w2', 'w3'])
+
+
+def test_footprints_are_aligned_on_the_union_of_activities(series):
+    assert series.activities == ['a', 'b', 'c', 'd']
+    assert series.codes.shape == (4, 4, 4)
+    assert series.present[3].tolist() == [True, False, True, True]
+    assert series.diff(0, 1)['changed_cells'] == [] and series.conformance(0, 1) == 1.0
+
+
+def test_diff_reports_footprint_cells_and_places(series):
+    diff = series.diff(1, 2)
+    assert (diff['from'], diff['to'], diff['conformance']) == ('w1', 'w2', 1 - 4 / 16)
+    assert diff['changed_cells'] == [('a', 'c', '#', '->'), ('b', 'c', '->', '||'),
+                                     ('c', 'a', '#', '<-'), ('c', 'b', '<-', '||')]
+    assert diff['added_places'] == [(('a',), ('c',)), (('b', 'c'), ('Ol',))]
+    assert diff['removed_places'] == [(('b',), ('c',)), (('c',), ('Ol',))]
+
+    diff = series.diff(2, 3)
+    assert (diff['added_activities'], diff['removed_activities']) == (['d'], ['b'])
+    assert ('d', 'c', '#', '->') in diff['changed_cells']
+    assert (('d',), ('c',)) in diff['added_places'] and (('a',), ('b',)) in diff['removed_places']
+
+
+def test_conformance_matrix_and_drift_points(series):
+    matrix = series.conformance_matrix()
+    pairwise = [[series.conformance(i, j) for j in range(len(series))] for i in range(len(series))]
+    assert np.allclose(matrix, pairwise)
+    assert np.allclose(series.consecutive_conformance(), [1.0, 0.75, 0.375])
+    assert series.drift_points() == [1, 2]
+    assert series.drift_points(threshold=0.5) == [2]
+
+
+def test_from_miners_matches_from_logs(series):
+    miners = [Alpha().parse_event_log(log).discover_relations().execute_alpha_algorithm() for log in WINDOWS]
+    rebuilt = FootprintSeries.from_miners(miners)
+    assert np.array_equal(rebuilt.codes, series.codes)
+    assert rebuilt.places == series.places
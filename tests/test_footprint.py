@@ -0,0 +1,21 @@
+import pytest
+
+from alpha import Alpha
+
+
+@pytest.fixture
+def miner():
+    return Alpha().parse_event_log('[<a,b,d>, <a,c,d>, <a,e,c,d>, <a,c,e,d>]').discover_relations()
+
+
+@pytest.mark.parametrize('as_dataframe', [False, True], ids=['footprint', 'dataframe'])
+def test_multiple_arrows_accept_footprint_and_dataframe(miner, as_dataframe):
+    if as_dataframe:
+        pytest.importorskip('pandas')
+        matrix = miner.create_footprint_matrix()
+    else:
+        matrix = miner.footprint
+    assert miner.find_multiple_arrows_in_row('a', matrix) == ('a', ['b', 'c', 'e'])
+    assert miner.find_multiple_arrows_in_column('d', matrix) == (['b', 'c', 'e'], 'd')
+    assert miner.find_multiple_arrows_in_row('b', matrix) is None
+    assert miner.find_split_and_join_patterns(matrix) == ([('a', ['b', 'c', 'e'])], [(['b', 'c', 'e'], 'd')])
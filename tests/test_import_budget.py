@@ -0,0 +1,7 @@
+from import_budget import measure_import
+
+
+def test_mining_path_does_not_load_optional_modules():
+    measurement = measure_import('alpha', repeat=1)
+    assert measurement['forbidden_loaded'] == []
+    assert measurement['lazy_loaded'] == []
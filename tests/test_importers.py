@@ -0,0 +1,77 @@
+import io
+from collections import Counter
+
+import pytest
+
+from alpha import Alpha
+from importers import iter_csv_traces, iter_xes_traces
+
+XES = """<?xml version="1.0" encoding="UTF-8"?>
+<log xmlns="http://www.xes-standard.org/">
+  <trace><string key="concept:name" value="caso 1"/>
+    <event><string key="concept:name" value="a"/><string key="lifecycle:transition" value="start"/></event>
+    <event><string key="concept:name" value="a"/><string key="lifecycle:transition" value="complete"/></event>
+    <event><string key="concept:name" value="b"/><string key="lifecycle:transition" value="COMPLETE"/></event>
+  </trace>
+  <trace>
+    <event><string key="concept:name" value="c"/></event>
+    <event><string key="org:resource" value="ana"/></event>
+  </trace>
+</log>
+"""
+
+CSV = """case_id,activity,timestamp
+1,a,2024-01-01T10:00:00
+2,a,2024-01-01T09:00:00
+1,c,2024-01-01T12:00:00
+2,c,2024-01-01T11:00:00
+1,b,2024-01-01T11:00:00
+2,b,2024-01-01T11:00:00
+3,x,5
+3,y,
+"""
+
+
+def test_xes_keeps_file_order_and_filters_lifecycle():
+    source = io.BytesIO(XES.encode('utf-8'))
+    assert list(iter_xes_traces(source)) == [['a', 'a', 'b'], ['c']]
+    source = io.BytesIO(XES.encode('utf-8'))
+    assert list(iter_xes_traces(source, lifecycle='complete')) == [['a', 'b'], ['c']]
+
+
+def test_csv_orders_each_case_by_timestamp(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text(CSV, encoding='utf-8')
+    # Empates en la marca: se conserva el orden del fichero; sin marca va primero
+    assert list(iter_csv_traces(path)) == [['a', 'b', 'c'], ['a', 'c', 'b'], ['y', 'x']]
+
+
+@pytest.mark.parametrize('partition_bytes', [1, 40, 1 << 20])
+def test_csv_partitions_group_every_case(tmp_path, partition_bytes):
+    rows = ['case_id,activity,timestamp']
+    expected = Counter()
+    for case in range(50):
+        activities = [f'act{(case + step) % 7}' for step in range(case % 4 + 1)]
+        expected[tuple(activities)] += 1
+        rows.extend(f'c{case},{activity},{step}' for step, activity in enumerate(activities))
+    # Filas de los casos intercaladas y en orden inverso
+    path = tmp_path / 'log.csv'
+    path.write_text('\n'.join([rows[0]] + rows[:0:-1]) + '\n', encoding='utf-8')
+
+    traces = Counter(map(tuple, iter_csv_traces(path, partition_bytes=partition_bytes)))
+    assert traces == expected
+    with open(path, 'rb') as stream:
+        assert Counter(map(tuple, iter_csv_traces(stream))) == expected
+
+
+def test_csv_grouped_rows_and_alpha_import(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text('case;activity;time\nA;b;2\nA;a;1\nB;a;1\nB;b;2\n', encoding='utf-8')
+    options = {'case_column': 'case', 'timestamp_column': 'time', 'delimiter': ';'}
+    assert list(iter_csv_traces(path, grouped=True, **options)) == [['a', 'b'], ['a', 'b']]
+    assert Alpha().import_csv(path, **options).variants == {('a', 'b'): 2}
+
+
+def test_csv_requires_case_and_activity_columns():
+    with pytest.raises(ValueError, match='case_id'):
+        list(iter_csv_traces(io.StringIO('case,activity\n1,a\n')))
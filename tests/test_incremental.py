@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from alpha import Alpha
+
+THRESHOLDS = [
+    {},
+    {'min_count': 2},
+    {'min_relative': 0.3},
+    {'min_dependency': 0.3},
+    {'min_count': 3, 'min_relative': 0.1, 'min_dependency': 0.6},
+]
+
+
+def _state(miner):
+    return (miner.activity_set, miner.entry_tasks, miner.exit_tasks, sorted(miner.causal_relations),
+            sorted(miner.concurrent_relations), sorted(miner.choice_relations), miner.footprint.codes.tolist(),
+            miner.places, miner.maximal_patterns, miner.place_labels, sorted(miner.flow_relations),
+            miner.direct_successions, miner.succession_matrix.tolist(), miner.pattern_pairs, miner.pruned)
+
+
+def _random_traces(rng):
+    activities = [chr(97 + i) for i in range(rng.randint(2, 9))]
+    return [[rng.choice(activities) for _ in range(rng.randint(1, 7))] for _ in range(rng.randint(2, 10))]
+
+
+@pytest.mark.parametrize('thresholds', THRESHOLDS)
+@pytest.mark.parametrize('seed', range(40))
+def test_update_matches_full_mining(seed, thresholds):
+    rng = random.Random(seed)
+    traces = _random_traces(rng)
+    first = rng.randint(0, len(traces))
+    second = rng.randint(first, len(traces))
+
+    full = Alpha(**thresholds)
+    full.event_log = traces
+    full.discover_relations().execute_alpha_algorithm()
+
+    incremental = Alpha(**thresholds)
+    for batch in (traces[:first], traces[first:second], traces[second:]):
+        incremental.add_traces(batch).update()
+    assert _state(incremental) == _state(full)
+
+
+def test_update_reports_changes():
+    miner = Alpha().parse_event_log('[<a,b,c>^2]').discover_relations().execute_alpha_algorithm()
+    miner.add_traces([['a', 'c', 'b']]).update()
+    assert ('b', 'c') in miner.concurrent_relations
+    assert ('b', 'c', '->', '||') in miner.last_update['changed_cells']
+    assert (('b',), ('c',)) in miner.last_update['removed_places']
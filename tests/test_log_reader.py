@@ -0,0 +1,55 @@
+import io
+import random
+from collections import Counter
+
+import pytest
+
+from log_reader import LogFormatError, count_event_log, count_log_text, iter_event_log
+
+NAMES = ['a', 'b', 'cd', 'é', ' e ', '"x, y"', '"p<q>"']
+
+
+def _log(seed, names):
+    rng = random.Random(seed)
+    traces = ['<' + ','.join(rng.choice(names) for _ in range(rng.randint(1, 4))) + '>'
+              + rng.choice(['', '', '^2', ' ^0', '^ 12']) for _ in range(rng.randint(1, 60))]
+    return '[' + ',\n'.join(traces) + ']'
+
+
+def _traced(data, chunk_size):
+    variants = Counter()
+    for activities, multiplier, _ in iter_event_log(io.BytesIO(data), chunk_size):
+        if multiplier > 0:
+            variants[activities] += multiplier
+    return variants
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('names', [NAMES[:5], NAMES], ids=['plain', 'quoted'])
+def test_count_event_log_matches_trace_reader(seed, names):
+    text = _log(seed, names)
+    data = text.encode('utf-8')
+    expected = _traced(data, 1 << 20)
+    assert count_log_text(text) == expected
+    for chunk_size in (1, 7, 64, 1 << 20):
+        counted = count_event_log(io.BytesIO(data), chunk_size)
+        assert counted == expected
+        assert list(counted) == list(expected)
+
+
+@pytest.mark.parametrize('text', ['[<a,b>, <a>', '<a,b>]', '[<a>, <b>] <c>', '<a>, <b>^', '<a>, <b, <c>', '<a>, x'])
+def test_count_event_log_reports_the_same_errors(text):
+    data = text.encode('utf-8')
+    for chunk_size in (1, 3, 1 << 20):
+        with pytest.raises(LogFormatError) as expected:
+            _traced(data, chunk_size)
+        with pytest.raises(LogFormatError) as counted:
+            count_event_log(io.BytesIO(data), chunk_size)
+        assert str(counted.value) == str(expected.value)
+
+
+def test_repeated_traces_share_interned_names():
+    variants = count_log_text('[' + ', '.join(['<alta,baja>'] * 5 + ['<baja,alta>^3']) + ']')
+    assert variants == {('alta', 'baja'): 5, ('baja', 'alta'): 3}
+    first, second = variants
+    assert first[0] is second[1]
@@ -0,0 +1,34 @@
+from itertools import combinations
+import random
+
+import pytest
+
+from alpha import Alpha
+
+
+def _random_log(rng, max_activities=7):
+    activities = [chr(97 + i) for i in range(rng.randint(2, max_activities))]
+    traces = ['<' + ','.join(rng.choice(activities) for _ in range(rng.randint(1, 7))) + '>'
+              for _ in range(rng.randint(1, 8))]
+    return '[' + ', '.join(traces) + ']'
+
+
+def _brute_force_places(miner):
+    """Y_L por definición: pares (A, B) de X_L maximales respecto a la inclusión"""
+    independent = [frozenset(subset) for size in range(1, len(miner.activity_set) + 1)
+                   for subset in combinations(miner.activity_set, size)
+                   if all((x, y) in miner.choice_relations for x in subset for y in subset)]
+    x_l = [(a, b) for a in independent for b in independent
+           if all((x, y) in miner.causal_relations for x in a for y in b)]
+    y_l = [pair for pair in x_l
+           if not any(other != pair and pair[0] <= other[0] and pair[1] <= other[1] for other in x_l)]
+    return sorted((tuple(sorted(a)), tuple(sorted(b))) for a, b in y_l)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_places_match_brute_force_enumeration(seed):
+    log = _random_log(random.Random(seed))
+    miner = Alpha().parse_event_log(log).discover_relations().execute_alpha_algorithm()
+    # Los dos últimos lugares son los de entrada (Il) y salida (Ol)
+    places = sorted((tuple(inputs), tuple(outputs)) for inputs, outputs in miner.places[:-2])
+    assert places == _brute_force_places(miner), log
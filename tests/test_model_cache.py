@@ -0,0 +1,62 @@
+import os
+
+from alpha import Alpha
+from model_cache import ModelCache
+
+
+def test_hits_misses_and_stored_copies():
+    cache = ModelCache()
+    assert cache.get('x') is None
+    state = {'places': [1, 2]}
+    cache.put('x', state)
+    state['places'].append(3)
+
+    stored = cache.get('x')
+    assert stored == {'places': [1, 2]}
+    stored['places'].clear()
+    assert cache.get('x') == {'places': [1, 2]}
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'disk_hits': 0, 'hit_rate': 2 / 3, 'entries': 1}
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ModelCache(max_entries=2)
+    cache.put('a', 1).put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_disk_tier_serves_evicted_entries(tmp_path):
+    cache = ModelCache(max_entries=1, directory=tmp_path)
+    cache.put('a', 'modelo a').put('b', 'modelo b')
+    assert len(cache) == 1
+    assert cache.get('a') == 'modelo a'
+    assert cache.disk_hits == 1
+    # Una caché nueva sobre el mismo directorio recupera los modelos guardados
+    assert ModelCache(directory=tmp_path).get('b') == 'modelo b'
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path):
+    cache = ModelCache(directory=tmp_path, max_disk_bytes=10 ** 6)
+    for age, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, key * 1000)
+        os.utime(tmp_path / f'{key}.pkl', (age, age))
+    cache.clear()
+    assert cache.get('a') == 'a' * 1000  # vuelve a ser el más reciente
+
+    size = os.path.getsize(tmp_path / 'a.pkl')
+    cache.max_disk_bytes = 3 * size
+    cache.put('d', 'd' * 1000)
+    assert sorted(os.listdir(tmp_path)) == ['a.pkl', 'c.pkl', 'd.pkl']
+
+
+def test_alpha_reuses_cached_model():
+    cache = ModelCache()
+    log = '[<a,b,d>, <a,c,d>]'
+    first = Alpha(cache=cache).parse_event_log(log).discover_relations().execute_alpha_algorithm()
+    second = Alpha(cache=cache).parse_event_log('[<a,c,d>, <a,b,d>]').discover_relations()
+    assert second.cache_hit and not first.cache_hit
+    assert second.execute_alpha_algorithm().places == first.places
+    assert second.fingerprint == first.fingerprint
@@ -0,0 +1,51 @@
+from collections import Counter
+
+import pytest
+
+from alpha import Alpha
+from log_generator import generate_variants
+
+
+def _mine(variants, **thresholds):
+    miner = Alpha(**thresholds)
+    miner.variants = Counter(variants)
+    return miner.discover_relations().execute_alpha_algorithm()
+
+
+@pytest.mark.parametrize('thresholds', [{}, {'min_count': 3}, {'min_relative': 0.2, 'min_dependency': 0.5}])
+def test_load_restores_pruned_and_successions(tmp_path, thresholds):
+    variants = generate_variants(n_activities=10, n_variants=30, multiplicity=5, seed=4)
+    miner = _mine(variants, **thresholds)
+    path = tmp_path / 'model.alpham'
+    miner.save(path)
+    loaded = Alpha.load(path)
+    assert loaded.pruned == miner.pruned
+    assert loaded._direct_successions is None
+    assert loaded.direct_successions == miner.direct_successions
+    assert loaded.places == miner.places
+
+
+@pytest.mark.parametrize('touch', [False, True])
+def test_loaded_model_updates_like_full_mining(tmp_path, touch):
+    items = list(generate_variants(n_activities=10, n_variants=30, multiplicity=5, seed=7).items())
+    path = tmp_path / 'model.alpham'
+    _mine(dict(items[:15]), min_count=2).save(path)
+    loaded = Alpha.load(path)
+    if touch:
+        loaded.direct_successions
+    loaded.add_traces(dict(items[15:])).update()
+    full = _mine(dict(items), min_count=2)
+    assert loaded.direct_successions == full.direct_successions
+    assert loaded.pruned == full.pruned
+    assert loaded.places == full.places
+
+
+@pytest.mark.parametrize('log', ['[<a,p1>]', '[<p0,b,c>, <p0,c,b>]', '[<p1,p0>^2, <p1,p2,p0>]'])
+def test_round_trip_with_activities_named_like_places(tmp_path, log):
+    miner = Alpha().parse_event_log(log).discover_relations().execute_alpha_algorithm()
+    path = tmp_path / 'model.alpham'
+    miner.save(path)
+    loaded = Alpha.load(path)
+    assert loaded.flow_relations == miner.flow_relations
+    assert loaded.places == miner.places
+    assert loaded.to_dict(include_footprint=True) == miner.to_dict(include_footprint=True)
@@ -0,0 +1,55 @@
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from alpha import Alpha
+from petri_render import layered_layout, render, write_dot, write_svg
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+@pytest.fixture
+def miner():
+    log = '[<a,b,c,d>^3, <a,c,b,d>^2, <a,"x<y & \\"z\\"",d>]'
+    return Alpha().parse_event_log(log).discover_relations().execute_alpha_algorithm()
+
+
+def test_layout_puts_initial_and_final_places_at_the_ends(miner):
+    layout = layered_layout(miner)
+    initial = next(f'p{idx}' for idx, (inputs, _) in enumerate(miner.places) if 'Il' in inputs)
+    final = next(f'p{idx}' for idx, (_, outputs) in enumerate(miner.places) if 'Ol' in outputs)
+    assert layout[initial][0] == 0
+    assert layout[final][0] == max(index for index, _ in layout.values())
+    assert layout['a'][0] < layout['b'][0] < layout['d'][0]
+    # Sin dos nodos en la misma posición
+    assert len(set(layout.values())) == len(layout)
+
+
+def test_dot_declares_every_node_and_flow(miner):
+    text = write_dot(miner, io.StringIO()).getvalue()
+    assert text.startswith('digraph petri_net {\n  rankdir=LR;\n') and text.endswith('}\n')
+    assert '"x<y & \\"z\\"" [shape=box' in text
+    assert text.count('[shape=box') == len(miner.activity_set)
+    assert text.count('[shape=circle') == len(miner.places)
+    assert text.count(' -> ') == len(miner.flow_relations)
+    assert text.count('rank=same') == len({index for index, _ in layered_layout(miner).values()})
+
+
+def test_svg_is_well_formed_and_escapes_labels(miner):
+    text = write_svg(miner, io.StringIO()).getvalue()
+    root = ET.fromstring(text)
+    assert len(root.findall(f'{SVG}rect')) == len(miner.activity_set)
+    assert len(root.findall(f'{SVG}circle')) == len(miner.places)
+    assert len(root.findall(f'{SVG}line')) + len(root.findall(f'{SVG}path')) == len(miner.flow_relations)
+    texts = [node.text for node in root.findall(f'{SVG}text')]
+    assert 'x<y & "z"' in texts
+    assert 'x&lt;y &amp; "z"' in text
+
+
+def test_render_picks_format_from_extension(miner, tmp_path):
+    miner.render(tmp_path / 'red.gv').render(tmp_path / 'red.svg')
+    assert (tmp_path / 'red.gv').read_text(encoding='utf-8').startswith('digraph')
+    assert (tmp_path / 'red.svg').read_text(encoding='utf-8').startswith('<svg')
+    with pytest.raises(ValueError, match='png'):
+        render(miner, io.StringIO(), 'png')
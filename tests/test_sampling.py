@@ -0,0 +1,37 @@
+from log_generator import generate_variants
+from sampling import SupportTracker, sample_log
+
+
+def test_new_pairs_count_as_singletons_regardless_of_multiplicity():
+    tracker = SupportTracker(confidence=0.99, min_traces=1)
+    tracker.add(('a', 'b'), 100)
+    assert tracker.singletons == 3
+    # Tres pares nuevos en una sola entrada: se esperan 3 pares nuevos por entrada
+    assert tracker.expected_new_pairs == 3.0
+    tracker.add(('a', 'b'), 50)
+    assert tracker.singletons == 0
+    assert tracker.traces == 150
+    assert tracker.entries == 2
+
+
+def test_sampling_does_not_stop_early_on_heavy_variants():
+    variants = generate_variants(n_activities=40, n_variants=2000, multiplicity=100, seed=0)
+    sample, report = sample_log(variants, confidence=0.99, seed=0)
+    assert report['expected_new_pairs'] > 0.0 or report['fraction_read'] == 1.0
+    assert report['entries_read'] == len(sample)
+    pairs = lambda traces: {pair for trace in traces for pair in zip(trace, trace[1:])}
+    assert len(pairs(variants) - pairs(sample)) <= 0.01 * len(pairs(variants))
+
+
+def test_bytes_read_include_boundary_resync(tmp_path):
+    from log_reader import shard_ranges
+
+    path = tmp_path / 'log.txt'
+    path.write_text('[' + ', '.join(f'<a,b{idx % 7},c>^{1 + idx % 5}' for idx in range(100000)) + ']',
+                    encoding='utf-8')
+    stats = {}
+    shard_ranges(path, 64, stats)
+    sample, report = sample_log(path, confidence=0.99, strata=64, seed=0)
+    assert report['stop_rule'] == 'confidence'
+    assert stats['bytes_scanned'] < report['bytes_read'] < report['bytes_total'] // 4
+    assert report['fraction_read'] == report['bytes_read'] / report['bytes_total']
@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import Executor, Future
+
+from batch import mine_log
+from service import MiningService
+
+LOG = '[<a,b,d>, <a,c,d>]'
+
+
+class ManualExecutor(Executor):
+    """Ejecutor que retiene las minerías hasta llamar a run()"""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.calls.append((future, fn, args, kwargs))
+        return future
+
+    def run(self):
+        for future, fn, args, kwargs in self.calls:
+            if not future.done():
+                future.set_result(fn(*args, **kwargs))
+
+
+def test_identical_requests_share_one_mining_and_then_the_cache():
+    async def scenario():
+        executor = ManualExecutor()
+        service = MiningService(executor=executor)
+        requests = [asyncio.ensure_future(service.mine(LOG)) for _ in range(3)]
+        other = asyncio.ensure_future(service.mine(LOG, {'footprint': True}))
+        await asyncio.sleep(0)
+        assert len(executor.calls) == 2 and service.coalesced == 2
+
+        executor.run()
+        models = await asyncio.gather(*requests)
+        assert models[0] == models[1] == models[2] == mine_log(LOG)
+        assert 'footprint' in await other
+
+        assert await service.mine(LOG) == models[0]
+        assert len(executor.calls) == 2
+        stats = service.stats()
+        assert (stats['mined'], stats['in_flight'], stats['cache']['hits']) == (2, 0, 1)
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_answers_503_with_retry_after():
+    async def scenario():
+        executor = ManualExecutor()
+        service = MiningService(executor=executor, max_pending=1)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def post(log):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            body = log.encode('utf-8')
+            writer.write(b'POST /mine HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+            response = await reader.read()
+            writer.close()
+            return response
+
+        async with server:
+            pending = asyncio.ensure_future(post(LOG))
+            while not executor.calls:
+                await asyncio.sleep(0.01)
+            rejected = await post('[<x,y>]')
+            assert rejected.startswith(b'HTTP/1.1 503 Service Unavailable\r\n')
+            assert b'Retry-After: 1\r\n' in rejected
+            # Una petición idéntica a la que está en curso se fusiona, no se rechaza
+            coalesced = asyncio.ensure_future(post(LOG))
+            while service.coalesced < 1:
+                await asyncio.sleep(0.01)
+
+            executor.run()
+            for response in await asyncio.gather(pending, coalesced):
+                assert response.startswith(b'HTTP/1.1 200 OK\r\n')
+            assert (service.rejected, service.mined) == (1, 1)
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from alpha import Alpha
+from log_generator import write_log
+from log_reader import shard_ranges
+from sharded import count_file
+
+QUOTED_NAMES = ['a', 'b', 'x y', '"<q>"', '"a<b<c"', '"p\\\\"', '"r\\"<s"', '"<,>"']
+
+
+def _quoted_log(seed):
+    rng = random.Random(seed)
+    traces = ['<' + ','.join(rng.choice(QUOTED_NAMES) for _ in range(rng.randint(1, 5))) + '>'
+              + rng.choice(['', '^2']) for _ in range(rng.randint(5, 40))]
+    return '[' + ', '.join(traces) + ']'
+
+
+@pytest.mark.parametrize('shards', [1, 2, 3, 7, 13])
+def test_count_file_matches_single_pass(tmp_path, shards):
+    path = tmp_path / 'log.txt'
+    write_log(path, n_activities=12, n_variants=60, seed=shards)
+    expected = Alpha().parse_event_log_file(path).variants
+    counts = count_file(path, workers=1, shards=shards, chunk_size=64)
+    assert counts['variants'] == expected
+    assert list(counts['variants']) == list(expected)
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('shards', [3, 7, 13])
+def test_count_file_with_quoted_angle_brackets(tmp_path, seed, shards):
+    path = tmp_path / 'quoted.txt'
+    path.write_text(_quoted_log(seed), encoding='utf-8')
+    expected = Alpha().parse_event_log_file(path).variants
+    for chunk_size in (4, 1 << 20):
+        assert count_file(path, workers=1, shards=shards, chunk_size=chunk_size)['variants'] == expected
+
+
+def test_shard_ranges_start_outside_quotes(tmp_path):
+    path = tmp_path / 'quoted.txt'
+    text = '[<"a<b<c",x,y>^2, <"<<<<",z>, <b>]'
+    path.write_text(text, encoding='utf-8')
+    for shards in range(2, len(text)):
+        for start, _ in shard_ranges(path, shards)[1:]:
+            assert start == len(text) or text[start] == '<' and text[:start].count('"') % 2 == 0
+
+
+def test_parallel_and_sampled_mining_accept_quoted_names(tmp_path):
+    path = tmp_path / 'quoted.txt'
+    path.write_text('[' + ', '.join(['<"a<b<c",x,y>^2', '<x,"<q>",y>'] * 50) + ']', encoding='utf-8')
+    expected = Alpha().parse_event_log_file(path).discover_relations().footprint.to_lists()
+    parallel = Alpha().discover_relations_parallel(path, workers=1, shards=7)
+    assert parallel.footprint.to_lists() == expected
+    sampled = Alpha().discover_relations_sampled(path, strata=7, min_traces=1)
+    assert sampled.activity_set == ['<q>', 'a<b<c', 'x', 'y']
+
+
+def test_count_file_recounts_ranges_that_start_inside_quotes(tmp_path, monkeypatch):
+    import sharded
+
+    text = '[' + ', '.join(['<"a<b<c",x,y>^2', '<x,"<q>, <r>",y>', '<z>'] * 20) + ']'
+    path = tmp_path / 'quoted.txt'
+    path.write_text(text, encoding='utf-8')
+    expected = Alpha().parse_event_log_file(path).variants
+    # Límites forzados en '<' entre comillas, como los daría una resincronización equivocada
+    inside = [idx for idx, char in enumerate(text) if char == '<' and text[idx - 1] in 'a"']
+    bounds = [0] + inside[3::9] + [len(text)]
+    monkeypatch.setattr(sharded, 'shard_ranges', lambda path, shards: list(zip(bounds, bounds[1:])))
+    assert sharded.count_file(path, workers=1)['variants'] == expected
+
+
+def test_shard_ranges_reads_only_resync_windows(tmp_path):
+    path = tmp_path / 'log.txt'
+    path.write_text('[' + ', '.join(f'<a,b{idx % 97},c>^{idx % 5}' for idx in range(200000)) + ']', encoding='utf-8')
+    stats = {}
+    ranges = shard_ranges(path, 16, stats)
+    assert len(ranges) == 16
+    assert stats['bytes_scanned'] < path.stat().st_size // 4
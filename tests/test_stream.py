@@ -0,0 +1,49 @@
+from alpha import Alpha
+from stream import TraceAssembler
+
+
+def test_end_activities_complete_interleaved_cases():
+    assembler = TraceAssembler(Alpha(), end_activities={'d'})
+    events = [(1, 'a'), (2, 'a'), (1, 'b'), (2, 'c'), (2, 'd'), (1, 'd')]
+    finished = [trace for case, activity in events for trace in assembler.push(case, activity, 0)]
+    assert finished == [(2, ['a', 'c', 'd']), (1, ['a', 'b', 'd'])]
+    assert assembler.stats()['open_cases'] == 0
+
+
+def test_timeout_completes_idle_cases():
+    assembler = TraceAssembler(Alpha(), timeout=3)
+    assert assembler.push('x', 'a', 0) == []
+    assert assembler.push('y', 'a', 1) == []
+    # Un evento con marca anterior no hace retroceder el reloj
+    assert assembler.push('y', 'b', 0.5) == []
+    assert assembler.push('y', 'c', 3.5) == [('x', ['a'])]
+    assert assembler.expire(10) == [('y', ['a', 'b', 'c'])]
+    assert (assembler.timed_out, assembler.completed) == (2, 2)
+
+
+def test_max_open_cases_evicts_least_recently_active():
+    dropped = TraceAssembler(Alpha(), max_open_cases=2)
+    kept = TraceAssembler(Alpha(), max_open_cases=2, complete_evicted=True)
+    for assembler in (dropped, kept):
+        assembler.push('x', 'a', 0)
+        assembler.push('y', 'a', 1)
+        assembler.push('x', 'b', 2)
+    assert dropped.push('z', 'a', 3) == []
+    assert kept.push('z', 'a', 3) == [('y', ['a'])]
+    for assembler in (dropped, kept):
+        assert assembler.evicted == 1
+        assert sorted(assembler.flush()) == [('x', ['a', 'b']), ('z', ['a'])]
+    assert (dropped.completed, kept.completed) == (2, 3)
+
+
+def test_model_matches_mining_the_completed_traces():
+    assembler = TraceAssembler(Alpha(), end_activities={'d'}, batch_size=2)
+    traces = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['a', 'e', 'd'], ['a', 'b', 'c', 'd']]
+    for step in range(4):
+        for case, trace in enumerate(traces):
+            if step < len(trace):
+                assembler.push(case, trace[step], step)
+    expected = Alpha().parse_event_log('[<a,b,c,d>^2, <a,c,b,d>, <a,e,d>]').discover_relations()
+    model = assembler.model()
+    assert model.places == expected.execute_alpha_algorithm().places
+    assert assembler.stats()['pending_traces'] == 0